@@ -1,7 +1,12 @@
+import importlib
+import os
 import streamlit as st
-import pandas as pd
-import framingData  # Import file tampilan framing
-import ethicalData  # Import file tampilan ethical
+import dataLoader
+import dataStore
+import metrics
+import timeSeries
+import workbookWatch
+from theme import Theme
 
 # --- 1. CONFIGURATION ---
 st.set_page_config(
@@ -11,14 +16,7 @@ st.set_page_config(
 )
 
 # --- 2. GLOBAL STYLING & COLORS ---
-class Theme:
-    BAD = "#FF0055"
-    GOOD = "#00FF9F"
-    NEUTRAL = "#4A90E2"
-    BG = "#121212"
-    TEXT = "#FFFFFF"
-
-# CSS Global
+# Warna ada di theme.Theme; CSS Global
 st.markdown(f"""
 <style>
     .stApp {{ background-color: {Theme.BG}; color: {Theme.TEXT}; }}
@@ -44,97 +42,82 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-# --- 3. DATA LOADER (Excel Multi-Sheet) ---
-file_path = 'Data Visualisasi UAS.xlsx'
-
-@st.cache_data(show_spinner=False)
-def load_data():
+# --- 3. DATA LOADER (Excel / Parquet / SQLite + Cache Kolumnar) ---
+# Sumber data dipilih lewat UAS_DATA_SOURCE (default: workbook Excel). Hanya kolom yang
+# ditampilkan yang diminta ke sumber (lihat dataLoader.SHARED_QUERIES / variant_queries).
+# Untuk Excel, parsing & cleaning di-cache sebagai Arrow IPC per hash workbook,
+# jadi proses baru / replica lain cukup memory-map file cache tanpa membuka Excel.
+# Loading bersifat lazy: sheet bersama dimuat sekali, sheet Framing / Real baru
+# di-parse saat halamannya pertama kali dibuka (dan di-cache terpisah).
+# Workbook yang diedit terdeteksi oleh watcher (fingerprint per sheet); hanya sheet yang
+# berubah yang di-parse ulang, lalu versi data baru dipakai sebagai key cache di bawah.
+data_source = dataLoader.source_from_env()
+
+@st.cache_resource(show_spinner=False)
+def data_watcher():
+    return workbookWatch.Watcher(data_source)
+
+def current_version():
+    # Sumber yang tidak bisa dibaca (file hilang dsb.) dilaporkan lewat st.error halaman;
+    # watcher yang gagal dibuat tidak di-cache, jadi dicoba lagi di rerun berikutnya
     try:
-        xls = pd.ExcelFile(file_path)
-        
-        # --- A. LOAD DATA TETAP (FIXED) ---
-        # Data ini sama baik untuk halaman Framing maupun Real
-        df5 = pd.read_excel(xls, sheet_name='Proyeksi Masa Depan')
-        df_trend = pd.read_excel(xls, sheet_name='Trend Katastropik')
-        df_pensiun = pd.read_excel(xls, sheet_name='Belanja Pensiun')
-        
-        # Porsi BPJS di-skip (None) sesuai request
-        df4 = None 
-
-        # --- B. LOAD DATA FRAMING (MANIPULASI) ---
-        # Pastikan nama sheet di Excel sesuai dengan string ini
-        df1_framing = pd.read_excel(xls, sheet_name='Komparasi Gaji (Framing)')
-        df2_framing = pd.read_excel(xls, sheet_name='Korelasi Lansia (Framing)')
-        df3_framing = pd.read_excel(xls, sheet_name='Benchmark Negara (Framing)')
-        df_roi_framing = pd.read_excel(xls, sheet_name='Analisis ROI (Framing)')
-
-        # --- C. LOAD DATA REAL (JUJUR) ---
-        df1_real = pd.read_excel(xls, sheet_name='Komparasi Gaji (Real)')
-        df2_real = pd.read_excel(xls, sheet_name='Korelasi Lansia (Real)')
-        df3_real = pd.read_excel(xls, sheet_name='Benchmark Negara (Real)')
-        df_roi_real = pd.read_excel(xls, sheet_name='Analisis ROI (Real)')
-
-        # --- D. DATA CLEANING & PREPROCESSING (All Dataframes) ---
-        # Kumpulkan semua df ke dalam list untuk dibersihkan sekaligus
-        all_dfs = [df1_framing, df2_framing, df3_framing, df_roi_framing,
-                   df1_real, df2_real, df3_real, df_roi_real,
-                   df5, df_trend, df_pensiun]
-
-        for df in all_dfs:
-            if df is not None:
-                df.columns = df.columns.str.strip() # Hapus spasi di nama kolom
-
-        # 1. Cleaning Proyeksi Masa Depan (df5)
-        df5 = df5.dropna(subset=['Tahun'])
-        df5['Tahun'] = df5['Tahun'].astype(int)
-        
-        col_gaji = 'Proyeksi Gaji DPR'
-        if col_gaji in df5.columns:
-            # Jika datanya masih dalam satuan Rupiah penuh (jutaan), bagi sejuta
-            if df5[col_gaji].mean() > 1000000:
-                df5[col_gaji] = df5[col_gaji] / 1000000
-            df5.rename(columns={col_gaji: 'Proyeksi Gaji DPR (Juta)'}, inplace=True)
-
-        # 2. Cleaning Benchmark Negara (df3 - Baik Real & Framing)
-        for d in [df3_framing, df3_real]:
-            col_bench = 'Gaji Pejabat per Tahun'
-            if col_bench in d.columns:
-                if d[col_bench].max() > 1000000: 
-                     d[col_bench] = d[col_bench] / 1000000000
-                d.rename(columns={col_bench: 'Gaji Pejabat per Tahun (Miliar Rupiah)'}, inplace=True)
-
-        # 3. Cleaning Trend (df_trend)
-        df_trend['Tahun'] = pd.to_numeric(df_trend['Tahun'], errors='coerce')
-        df_trend['Biaya'] = pd.to_numeric(df_trend['Biaya'], errors='coerce')
-        df_trend = df_trend.dropna()
-
-        # 4. Cleaning ROI (df_roi)
-        for d in [df_roi_framing, df_roi_real]:
-            if 'Nominal' in d.columns:
-                d['Nominal'] = pd.to_numeric(d['Nominal'], errors='coerce')
-
-        # 5. Cleaning Lansia (df2)
-        for d in [df2_framing, df2_real]:
-             d['Tahun'] = d['Tahun'].astype(int)
-
-        # --- E. PACKING DATA ---
-        # Urutan Pack harus: df1, df2, df3, df4, df5, df_roi, df_trend, df_pensiun
-        
-        pack_framing = (df1_framing, df2_framing, df3_framing, df4, df5, df_roi_framing, df_trend, df_pensiun)
-        pack_real    = (df1_real, df2_real, df3_real, df4, df5, df_roi_real, df_trend, df_pensiun)
-
-        return pack_framing, pack_real, None
+        return data_watcher().version, None
+    except Exception as e:
+        return None, str(e)
+
+# Data pack disimpan sekali per proses di dataStore (buffer read-only, dipakai bersama semua
+# sesi); setiap rerun hanya menerima view dangkal, bukan salinan hasil unpickle st.cache_data.
+# Frame bersama (df5, df_trend, df_pensiun) adalah buffer yang sama di kedua pack.
+def load_shared(data_version):
+    return dataStore.get(('shared', data_version), lambda: dataLoader.load_shared(data_source))
 
+def load_data(variant, data_version):
+    try:
+        return dataStore.get((variant, data_version), lambda: dataLoader.load_pack(
+            variant, data_source, shared=load_shared(data_version))), data_version, None
     except Exception as e:
         return None, None, str(e)
 
-# Load Data
-pack_framing, pack_real, error_msg = load_data()
-
-# Error Handling Basic
-if error_msg:
-    st.error(f"Gagal load data: {error_msg}")
-    st.stop()
+# UAS_WARM_FIGURES=1: saat halaman pertama kali dibuka, bangun semua chart untuk semua
+# nilai slider sekaligus, jadi geser slider setelahnya hanya lookup cache figure.
+@st.cache_resource(show_spinner=False)
+def warm_figures(variant, data_version, _page_module, _data_pack):
+    _page_module.warm_figures(_data_pack, Theme, data_version)
+
+# Modul halaman (dan plotly.express di dalamnya) baru di-import saat halamannya dibuka,
+# jadi cold start replica tidak membayar import halaman yang belum diminta.
+# Budget waktu import startup dicek oleh: python benchmark.py --only startup
+PAGE_MODULES = {'framing': 'framingData', 'real': 'ethicalData'}
+
+def page_module_for(variant):
+    with metrics.span(f'import.{variant}'):
+        return importlib.import_module(PAGE_MODULES[variant])
+
+# Rentang tahun semua chart tren (deret waktu sudah urut Tahun, jadi potongannya binary search).
+# Rentang penuh = None, supaya key cache figure sama dengan figure yang di-warm.
+def year_range(variant, data_pack):
+    bounds = timeSeries.year_bounds(data_pack)
+    if bounds is None or bounds[0] == bounds[1]:
+        return None
+    years = st.sidebar.slider("Rentang Tahun:", min_value=bounds[0], max_value=bounds[1],
+                              value=bounds, step=1, key=f"years.{variant}")
+    return None if tuple(years) == bounds else tuple(years)
+
+def show_page(variant):
+    page_module = page_module_for(variant)
+    data_version, error_msg = current_version()
+    if not error_msg:
+        data_pack, data_version, error_msg = load_data(variant, data_version)
+
+    # Error Handling Basic (hanya memblokir halaman yang datanya rusak)
+    if error_msg:
+        st.error(f"Gagal load data: {error_msg}")
+        st.stop()
+
+    if os.environ.get('UAS_WARM_FIGURES', '0') == '1':
+        warm_figures(variant, data_version, page_module, data_pack)
+
+    page_module.show(data_pack, Theme, data_version, year_range(variant, data_pack))
 
 # --- 4. NAVIGATION ---
 st.sidebar.title("Navigasi Laporan")
@@ -147,7 +130,13 @@ st.sidebar.markdown("---")
 
 # --- 5. ROUTING ---
 if page == "Dashboard Framing (Manipulasi)":
-    framingData.show(pack_framing, Theme)
+    with metrics.span('rerun.framing'):
+        show_page('framing')
 
 elif page == "Data Sebenarnya (Jujur)":
-    ethicalData.show(pack_real, Theme)
\ No newline at end of file
+    with metrics.span('rerun.real'):
+        show_page('real')
+
+# --- 6. METRICS (UAS_METRICS=1) ---
+metrics.show_panel()
+metrics.flush()
@@ -0,0 +1,267 @@
+"""Benchmark: load data, build per chart, dan render penuh per halaman.
+
+Hasil ditulis sebagai JSON supaya bisa dibandingkan antar commit:
+    python benchmark.py --json bench/HEAD.json
+    python benchmark.py --json bench/new.json --compare bench/HEAD.json   # exit 1 kalau ada regresi
+
+Yang diukur:
+    load.cold.<variant>          load_pack tanpa cache kolumnar (parse Excel + cleaning)
+    load.warm.<variant>          load_pack dari cache Arrow
+    chart.<page>.<n>.<factor>x   satu chart builder (tanpa cache figure & memo analisis) per nilai slider
+    page.<page>.<cold|warm>.<factor>x
+                                 rerun penuh app.py lewat AppTest (semua cache figure & memo
+                                 analisis dikosongkan / terisi)
+    startup.imports              import top-level app.py di proses Python baru (cold start replica)
+
+Budget startup (exit 1 kalau import melebihi budget atau modul lazy ikut ter-import):
+    python benchmark.py --only startup --import-budget 800
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import benchmarkFit
+import correlationEngine
+import dataLoader
+import downsample
+import ethicalData
+import figureCache
+import figureStore
+import framingData
+import scenarioEngine
+import sheetCache
+from theme import Theme
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# variant -> (modul halaman, label radio di app.py)
+PAGES = {
+    'framing': (framingData, "Dashboard Framing (Manipulasi)"),
+    'real': (ethicalData, "Data Sebenarnya (Jujur)"),
+}
+
+
+def clear_caches():
+    """Kosongkan cache figure + semua memo yang dipakai builder (tabel skenario, Monte Carlo,
+    fit benchmark, korelasi, downsampling) supaya rerun cold benar-benar menghitung ulang."""
+    figureCache.clear()
+    scenarioEngine.clear()
+    benchmarkFit.clear()
+    correlationEngine.clear()
+    downsample.clear()
+
+
+def measure(fn, repeat, setup=None):
+    """Jalankan fn sebanyak `repeat` kali, return ringkasan waktu (milidetik)."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    return {
+        'n': len(samples),
+        'median_ms': statistics.median(samples),
+        'mean_ms': statistics.fmean(samples),
+        'min_ms': min(samples),
+        'stdev_ms': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def bench_load(results, repeat):
+    original_dir = sheetCache.CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        sheetCache.CACHE_DIR = tmp
+        try:
+            for variant in PAGES:
+                os.environ['UAS_SHEET_CACHE'] = '0'
+                results[f'load.cold.{variant}'] = measure(lambda: dataLoader.load_pack(variant), repeat)
+                os.environ['UAS_SHEET_CACHE'] = '1'
+                dataLoader.load_pack(variant)  # isi cache
+                results[f'load.warm.{variant}'] = measure(lambda: dataLoader.load_pack(variant), repeat)
+        finally:
+            sheetCache.CACHE_DIR = original_dir
+            os.environ.pop('UAS_SHEET_CACHE', None)
+
+
+def bench_charts(results, repeat):
+    for variant, (page_module, _) in PAGES.items():
+        data_pack = dataLoader.load_pack(variant)
+        for chart, builder in page_module.CHART_BUILDERS.items():
+            for factor in scenarioEngine.MULTIPLIERS:
+                results[f'chart.{variant}.{chart}.{factor}x'] = measure(
+                    lambda: builder(data_pack, Theme, factor), repeat, setup=clear_caches)
+
+
+def bench_pages(results, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    # cold = benar-benar membangun figure: cache disk dimatikan supaya tetap sebanding antar commit
+    figureStore.ENABLED = False
+    for variant, (_, label) in PAGES.items():
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        at.sidebar.radio[0].set_value(label).run()
+
+        for factor in scenarioEngine.MULTIPLIERS:
+            def rerun():
+                slider = next(s for s in at.slider if s.label.startswith('Multiplier'))
+                slider.set_value(factor).run()
+                if at.exception:
+                    raise RuntimeError(at.exception[0].message)
+
+            results[f'page.{variant}.cold.{factor}x'] = measure(rerun, repeat, setup=clear_caches)
+            results[f'page.{variant}.warm.{factor}x'] = measure(rerun, repeat)
+
+
+# --- BUDGET IMPORT STARTUP ---
+IMPORT_BUDGET_MS = float(os.environ.get('UAS_IMPORT_BUDGET_MS', '1000'))
+
+# Modul yang seharusnya baru di-import saat halaman dibuka (lihat app.PAGE_MODULES)
+LAZY_MODULES = ('framingData', 'ethicalData', 'plotly.express')
+
+_STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+print(json.dumps({{'ms': (time.perf_counter() - start) * 1000,
+                  'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def startup_imports():
+    """Statement import top-level app.py (dibayar sebelum halaman apa pun dirender)."""
+    with open(APP_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def bench_startup(results, repeat):
+    """Waktu import startup di proses baru (cache modul Python kosong). Return modul lazy yang ter-import."""
+    probe = _STARTUP_PROBE.format(imports='\n'.join(startup_imports()), lazy=LAZY_MODULES)
+    samples, loaded = [], set()
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(APP_PATH)).stdout
+        probe_result = json.loads(out.strip().splitlines()[-1])
+        samples.append(probe_result['ms'])
+        loaded.update(probe_result['loaded'])
+    results['startup.imports'] = summarize(samples)
+    return sorted(loaded)
+
+
+def check_startup(results, loaded, budget_ms):
+    """Return daftar pelanggaran budget startup (kosong = lolos)."""
+    failures = []
+    median = results['startup.imports']['median_ms']
+    if median > budget_ms:
+        failures.append(f"import startup {median:.0f} ms > budget {budget_ms:.0f} ms")
+    if loaded:
+        failures.append(f"modul lazy ter-import saat startup: {', '.join(loaded)}")
+    return failures
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(APP_PATH)).stdout.strip()
+    except OSError:
+        commit = ''
+    import pandas
+    import plotly
+    import streamlit
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pandas.__version__,
+        'plotly': plotly.__version__,
+        'streamlit': streamlit.__version__,
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Cetak perbandingan median vs baseline; return daftar benchmark yang regresi."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    print(f"{'benchmark':45s} {'base ms':>10s} {'new ms':>10s} {'ratio':>7s}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        base, new = baseline[name]['median_ms'], stats['median_ms']
+        ratio = new / base if base > 0 else float('inf')
+        flag = ''
+        # Abaikan selisih absolut yang sangat kecil (noise timer)
+        if ratio > 1 + threshold and new - base > 0.05:
+            regressions.append(name)
+            flag = '  <-- REGRESI'
+        print(f"{name:45s} {base:10.3f} {new:10.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load data, chart builder, dan render halaman.")
+    parser.add_argument('--json', help="Tulis hasil ke file JSON ini")
+    parser.add_argument('--compare', help="File JSON baseline untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Batas kenaikan median yang dianggap regresi (default 0.25 = +25%%)")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah ulangan per benchmark")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET_MS,
+                        help="Budget median waktu import startup dalam ms (default UAS_IMPORT_BUDGET_MS / 1000)")
+    parser.add_argument('--only', choices=['startup', 'load', 'chart', 'page'], action='append',
+                        help="Jalankan kelompok tertentu saja (bisa diulang)")
+    args = parser.parse_args()
+
+    # Log Streamlit (mis. peringatan bare mode) tidak relevan untuk benchmark
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    groups = args.only or ['startup', 'load', 'chart', 'page']
+    results = {}
+    startup_failures = []
+    if 'startup' in groups:
+        startup_failures = check_startup(results, bench_startup(results, args.repeat), args.import_budget)
+    if 'load' in groups:
+        bench_load(results, args.repeat)
+    if 'chart' in groups:
+        bench_charts(results, args.repeat)
+    if 'page' in groups:
+        bench_pages(results, args.repeat)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+
+    regressions = []
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark regresi > {args.threshold:.0%}")
+    else:
+        for name, stats in results.items():
+            print(f"{name:45s} median {stats['median_ms']:9.3f} ms  (min {stats['min_ms']:.3f}, n={stats['n']})")
+
+    for failure in startup_failures:
+        print(f"BUDGET STARTUP: {failure}")
+    if regressions or startup_failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import metrics
+
+# --- FIT GAJI vs CPI (Benchmark Negara) ---
+# OLS + regresi robust (Huber) atas semua negara, dengan interval kepercayaan bootstrap.
+# Semua sampel bootstrap dihitung sekaligus sebagai matriks (sampel x titik), dipecah per
+# batch supaya panel ribuan negara-tahun tetap muat di memori.
+
+N_BOOT = int(os.environ.get('UAS_BOOTSTRAP', '1000'))
+CONFIDENCE = 95
+GRID_POINTS = 50
+
+# Halaman Framing tetap memakai garis dua titik pilihan; fit jujur ditumpuk hanya bila diminta
+FRAMING_OVERLAY = os.environ.get('UAS_HONEST_FIT', '0') == '1'
+
+# Batas elemen matriks bootstrap per batch (~32 MB float64 per array)
+BATCH_ELEMENTS = 4_000_000
+
+HUBER_K = 1.345
+HUBER_ITERATIONS = 50
+
+_fit_cache = {}
+
+
+class Fit(NamedTuple):
+    n: int
+    slope: float
+    intercept: float
+    r2: float
+    robust_slope: float
+    robust_intercept: float
+    slope_ci: tuple         # (bawah, atas) slope OLS dari bootstrap
+    band: pd.DataFrame      # x, fit, lower, upper (garis OLS + pita CI)
+
+
+def _wls(x, y, w=None):
+    """Slope & intercept least squares (berbobot) di sumbu terakhir; berlaku untuk batch 2D."""
+    if w is None:
+        w = np.ones_like(x)
+    sw = w.sum(axis=-1)
+    mx = (w * x).sum(axis=-1) / sw
+    my = (w * y).sum(axis=-1) / sw
+    dx = x - mx[..., None]
+    sxx = (w * dx * dx).sum(axis=-1)
+    sxy = (w * dx * (y - my[..., None])).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)  # resample dengan x seragam: slope tak terdefinisi
+    return slope, my - slope * mx
+
+
+def _huber(x, y, slope, intercept):
+    # IRLS: bobot titik dengan residual besar diturunkan (skala residual dari MAD)
+    for _ in range(HUBER_ITERATIONS):
+        resid = y - (intercept + slope * x)
+        scale = np.median(np.abs(resid - np.median(resid))) / 0.6745
+        if not scale > 0:
+            break
+        w = np.minimum(1.0, HUBER_K * scale / np.maximum(np.abs(resid), 1e-12))
+        new_slope, new_intercept = _wls(x, y, w)
+        if np.isclose(new_slope, slope) and np.isclose(new_intercept, intercept):
+            slope, intercept = new_slope, new_intercept
+            break
+        slope, intercept = new_slope, new_intercept
+    return float(slope), float(intercept)
+
+
+def _bootstrap(x, y, grid, n_boot, seed):
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    batch = max(1, BATCH_ELEMENTS // max(n, 1))
+    slopes, intercepts = [], []
+    for start in range(0, n_boot, batch):
+        idx = rng.integers(0, n, (min(batch, n_boot - start), n))
+        s, c = _wls(x[idx], y[idx])
+        slopes.append(s)
+        intercepts.append(c)
+    slopes, intercepts = np.concatenate(slopes), np.concatenate(intercepts)
+    valid = ~np.isnan(slopes)
+    slopes, intercepts = slopes[valid], intercepts[valid]
+    if not len(slopes):
+        return (np.nan, np.nan), np.full(len(grid), np.nan), np.full(len(grid), np.nan)
+
+    tail = (100 - CONFIDENCE) / 2
+    slope_ci = np.percentile(slopes, [tail, 100 - tail])
+    lines = intercepts[:, None] + slopes[:, None] * grid[None, :]
+    lower, upper = np.percentile(lines, [tail, 100 - tail], axis=0)
+    return (float(slope_ci[0]), float(slope_ci[1])), lower, upper
+
+
+def fit(df, x, y, x_range=None, n_boot=N_BOOT, seed=0):
+    """Fit y ~ x atas semua baris valid df. Return Fit (None kalau titik < 2).
+
+    x_range: (awal, akhir) pita CI; default 0 s/d x maksimum. Di-cache per isi kolom
+    (jadi otomatis per versi sheet) + parameter.
+    """
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    valid = ~(np.isnan(xs) | np.isnan(ys))
+    xs, ys = xs[valid], ys[valid]
+    if len(xs) < 2:
+        return None
+
+    x_range = tuple(x_range) if x_range is not None else (0.0, float(xs.max()))
+    key = (xs.tobytes(), ys.tobytes(), x_range, n_boot, seed)
+    cached = _fit_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with metrics.span('benchmark.fit'):
+        result = _fit(xs, ys, x_range, n_boot, seed)
+    if len(_fit_cache) >= 32:
+        _fit_cache.clear()
+    _fit_cache[key] = result
+    return result
+
+
+def _fit(xs, ys, x_range, n_boot, seed):
+    slope, intercept = _wls(xs, ys)
+    slope, intercept = float(slope), float(intercept)
+    total = ((ys - ys.mean()) ** 2).sum()
+    r2 = 1 - ((ys - (intercept + slope * xs)) ** 2).sum() / total if total > 0 else np.nan
+    if np.isnan(slope):
+        robust_slope, robust_intercept = np.nan, np.nan
+    else:
+        robust_slope, robust_intercept = _huber(xs, ys, slope, intercept)
+
+    grid = np.linspace(x_range[0], x_range[1], GRID_POINTS)
+    slope_ci, lower, upper = _bootstrap(xs, ys, grid, n_boot, seed)
+    band = pd.DataFrame({'x': grid, 'fit': intercept + slope * grid, 'lower': lower, 'upper': upper})
+    return Fit(len(xs), slope, intercept, float(r2), robust_slope, robust_intercept, slope_ci, band)
+
+
+def clear():
+    _fit_cache.clear()
+
+
+# --- OVERLAY KE FIGURE ---
+def overlay(fig, result, line_color, fill_color, robust_color=None):
+    """Tambahkan pita CI, garis OLS, dan (opsional) garis robust ke scatter benchmark."""
+    if result is None or np.isnan(result.slope):
+        return fig
+    band = result.band
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([band['x'], band['x'][::-1]]),
+        y=np.concatenate([band['upper'], band['lower'][::-1]]),
+        fill='toself', fillcolor=fill_color, line=dict(width=0),
+        hoverinfo='skip', showlegend=False, name=f'CI {CONFIDENCE}%'
+    ))
+    fig.add_trace(go.Scatter(
+        x=band['x'], y=band['fit'], mode='lines', line=dict(color=line_color, width=2),
+        name=f'OLS (n={result.n}, R²={result.r2:.2f})',
+        hovertemplate=(f'OLS: CPI = {result.intercept:.1f} + {result.slope:.1f} × gaji'
+                       f'<br>slope CI {CONFIDENCE}%: {result.slope_ci[0]:.1f} s/d {result.slope_ci[1]:.1f}'
+                       '<extra></extra>')
+    ))
+    if robust_color is not None and not np.isnan(result.robust_slope):
+        x = band['x'].to_numpy()[[0, -1]]
+        fig.add_trace(go.Scatter(
+            x=x, y=result.robust_intercept + result.robust_slope * x, mode='lines',
+            line=dict(color=robust_color, width=1.5, dash='dot'), name='Robust (Huber)',
+            hovertemplate=(f'Huber: CPI = {result.robust_intercept:.1f} + {result.robust_slope:.1f} × gaji'
+                           '<extra></extra>')
+        ))
+    return fig
@@ -0,0 +1,54 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- NORMALISASI KATEGORI (Komparasi Gaji) ---
+# Label mentah dari sheet dipetakan ke kategori kanonik sekali saat load. Hasilnya kolom
+# categorical, jadi halaman cukup mengganti nama kategori (O(jumlah kategori), bukan O(baris)).
+
+# Urutan = prioritas: label yang cocok dengan beberapa pola memakai pola paling atas
+# (sama dengan urutan timpa str.contains lama: Gaji menimpa Katastropik menimpa Pensiun).
+RULES = [
+    ('Suntik Mati', re.compile(r'^suntik mati$', re.IGNORECASE)),
+    ('Gaji DPR', re.compile(r'gaji', re.IGNORECASE)),
+    ('Biaya Katastropik BPJS', re.compile(r'katastropik', re.IGNORECASE)),
+    ('Belanja Pensiun', re.compile(r'pensiun', re.IGNORECASE)),
+]
+
+CANONICAL = [name for name, _ in RULES]
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def resolve(label):
+    """Kategori kanonik satu label mentah (label tak dikenal dikembalikan apa adanya, dirapikan)."""
+    label = _WHITESPACE.sub(' ', str(label).strip())
+    for name, pattern in RULES:
+        if pattern.search(label):
+            return name
+    return label
+
+
+def normalize(series):
+    """Series label mentah -> Series categorical kanonik.
+
+    Pencocokan hanya dijalankan pada label unik (pd.factorize), jadi biaya string
+    tetap kecil walau ledger berisi jutaan baris dengan label berulang.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    resolved = [resolve(label) for label in uniques]
+    extra = [label for label in dict.fromkeys(resolved) if label not in CANONICAL]
+    categories = CANONICAL + extra
+    position = {name: i for i, name in enumerate(categories)}
+    lookup = np.array([position[label] for label in resolved] + [-1], dtype=np.int32)
+    # Sentinel NaN (-1) menunjuk elemen terakhir lookup = -1 (tetap NaN di categorical)
+    return pd.Series(pd.Categorical.from_codes(lookup[codes], categories),
+                     index=series.index, name=series.name)
+
+
+def display(series, labels):
+    """Ganti nama kategori kanonik ke label tampilan halaman (tanpa menyentuh tiap baris)."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = normalize(series)  # sumber tanpa dtype kategori (mis. SQLite)
+    return series.cat.rename_categories(lambda name: labels.get(name, name))
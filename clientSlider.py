@@ -0,0 +1,52 @@
+import os
+
+import plotly.graph_objects as go
+
+# --- SLIDER DI BROWSER (chart 8-10) ---
+# UAS_CLIENT_SLIDER=1: setiap chart simulasi dikirim sekali berisi semua nilai multiplier
+# sebagai Plotly frames + slider bawaan Plotly. Pergantian nilai terjadi di browser,
+# tanpa rerun Python dan tanpa request tambahan ke server.
+
+SLIDER_MARGIN_BOTTOM = 90
+
+
+def enabled():
+    return os.environ.get('UAS_CLIENT_SLIDER', '0') == '1'
+
+
+def _varying_keys(layouts):
+    # Key layout yang nilainya tidak sama di semua frame (mis. yaxis.range per multiplier)
+    keys = set().union(*layouts) - {'template'}
+    return {k for k in keys if any(layout.get(k) != layouts[0].get(k) for layout in layouts)}
+
+
+def _frame_layout(layout, keys):
+    # Frame hanya membawa bagian layout yang berbeda antar frame (template dll. tidak diulang 6x),
+    # tapi selalu lengkap untuk setiap frame, termasuk frame aktif: kembali ke 1.0x dari 3.0x
+    # harus ikut mengembalikan range sumbu 1.0x
+    return {k: layout[k] for k in keys if k in layout}
+
+
+def combine(figures, active, prefix="Multiplier Kebijakan: "):
+    """figures: dict {multiplier: go.Figure} (struktur trace sama). Return satu figure + slider."""
+    base = go.Figure(figures[active])  # salinan: figure di cache tidak diubah
+    layouts = {factor: fig.layout.to_plotly_json() for factor, fig in figures.items()}
+    keys = _varying_keys(list(layouts.values()))
+
+    frames, steps = [], []
+    for factor, fig in figures.items():
+        name = f"{factor}x"
+        frames.append(go.Frame(name=name, data=fig.data, layout=_frame_layout(layouts[factor], keys)))
+        steps.append(dict(
+            label=name, method='animate',
+            args=[[name], dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))]
+        ))
+    base.frames = frames
+
+    margin_bottom = max(base.layout.margin.b or 0, SLIDER_MARGIN_BOTTOM)
+    base.update_layout(
+        sliders=[dict(active=list(figures).index(active), steps=steps, currentvalue=dict(prefix=prefix),
+                      x=0, len=1, y=0, yanchor='top', pad=dict(t=40))],
+        margin=dict(b=margin_bottom)
+    )
+    return base
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# --- UJI KORELASI (Korelasi Lansia) ---
+# Pearson, Spearman, korelasi lag, dan uji permutasi untuk setiap pasangan kolom numerik.
+# Semua pasangan dihitung sekaligus sebagai perkalian matriks kolom terstandar; uji permutasi
+# mengacak urutan baris sekali per permutasi lalu menghitung ulang seluruh matriks korelasi
+# (batch permutasi x baris x kolom), jadi ratusan indikator tetap selesai dalam hitungan detik.
+
+N_PERMUTATIONS = int(os.environ.get('UAS_PERMUTATIONS', '10000'))
+MAX_LAG = 2
+MIN_ROWS = 3
+
+TIME_COLUMN = 'Tahun'
+
+# Batas elemen array null per batch (permutasi x kolom x kolom)
+BATCH_ELEMENTS = 8_000_000
+
+_result_cache = {}
+
+
+def _standardize(values):
+    # Kolom konstan -> NaN (korelasi tak terdefinisi), bukan pembagian nol diam-diam
+    centered = values - values.mean(axis=0)
+    norm = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return centered / np.where(norm > 0, norm, np.nan)
+
+
+def _corr(a, b):
+    """Matriks korelasi kolom a x kolom b (baris sudah sejajar)."""
+    return _standardize(a).T @ _standardize(b)
+
+
+def _ranks(values):
+    return pd.DataFrame(values).rank(method='average').to_numpy()
+
+
+def _lagged(values, lag):
+    # Korelasi x(t) dengan y(t + lag): x mendahului y sebanyak `lag` baris
+    if len(values) - lag < MIN_ROWS:
+        return np.full((values.shape[1], values.shape[1]), np.nan)
+    return _corr(values[:-lag], values[lag:])
+
+
+def _permutation_p(z, observed, n_permutations, seed):
+    """p-value dua sisi per pasangan: baris satu sisi diacak, sisi lain tetap."""
+    rng = np.random.default_rng(seed)
+    n, p = z.shape
+    exceed = np.zeros((p, p))
+    threshold = np.abs(observed) - 1e-12
+    batch = max(1, BATCH_ELEMENTS // max(p * p, n * p))
+    for start in range(0, n_permutations, batch):
+        size = min(batch, n_permutations - start)
+        order = rng.permuted(np.broadcast_to(np.arange(n), (size, n)), axis=1)
+        null = np.einsum('bni,nj->bij', z[order], z, optimize=True)
+        exceed += (np.abs(null) >= threshold).sum(axis=0)
+    return np.where(np.isnan(observed), np.nan, (exceed + 1) / (n_permutations + 1))
+
+
+def analyze(df, columns=None, max_lag=MAX_LAG, n_permutations=N_PERMUTATIONS, seed=0):
+    """Statistik korelasi semua pasangan kolom numerik df (selain Tahun).
+
+    Return DataFrame satu baris per pasangan (x, y): n, pearson, spearman, p_value (uji
+    permutasi Pearson), lag_1..lag_{max_lag}. Baris diurutkan menurut Tahun bila ada; baris
+    dengan nilai kosong dibuang. Di-cache per isi data (jadi per versi dataset) + parameter.
+    """
+    if TIME_COLUMN in df.columns:
+        df = df.sort_values(TIME_COLUMN)
+    if columns is None:
+        columns = [c for c in df.columns if c != TIME_COLUMN and pd.api.types.is_numeric_dtype(df[c])]
+    values = df[list(columns)].to_numpy(dtype=float)
+    values = values[~np.isnan(values).any(axis=1)]
+
+    key = (tuple(columns), values.shape, values.tobytes(), max_lag, n_permutations, seed)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with metrics.span('analysis.correlation'):
+        result = _analyze(values, list(columns), max_lag, n_permutations, seed)
+    if len(_result_cache) >= 32:
+        _result_cache.clear()
+    _result_cache[key] = result
+    return result
+
+
+def _analyze(values, columns, max_lag, n_permutations, seed):
+    n, p = values.shape
+    pairs = np.triu_indices(p, k=1)
+    rows = {'x': np.asarray(columns, dtype=object)[pairs[0]],
+            'y': np.asarray(columns, dtype=object)[pairs[1]],
+            'n': np.full(len(pairs[0]), n)}
+    if n < MIN_ROWS:
+        for name in ['pearson', 'spearman', 'p_value'] + [f'lag_{lag}' for lag in range(1, max_lag + 1)]:
+            rows[name] = np.full(len(pairs[0]), np.nan)
+        return pd.DataFrame(rows)
+
+    z = _standardize(values)
+    pearson = z.T @ z
+    rows['pearson'] = pearson[pairs]
+    rows['spearman'] = _corr(_ranks(values), _ranks(values))[pairs]
+    rows['p_value'] = _permutation_p(z, pearson, n_permutations, seed)[pairs]
+    for lag in range(1, max_lag + 1):
+        rows[f'lag_{lag}'] = _lagged(values, lag)[pairs]
+    return pd.DataFrame(rows)
+
+
+def pair(result, x, y):
+    """Baris hasil untuk satu pasangan kolom (urutan x/y bebas); None kalau tidak ada."""
+    match = result[((result['x'] == x) & (result['y'] == y)) | ((result['x'] == y) & (result['y'] == x))]
+    return None if match.empty else match.iloc[0]
+
+
+def clear():
+    _result_cache.clear()
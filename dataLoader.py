@@ -0,0 +1,427 @@
+import hashlib
+import multiprocessing
+import os
+import posixpath
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import categoryMap
+import dataSources
+import derivedColumns
+import frameCompact
+import metrics
+import sheetCache
+import timeSeries
+from dataSources import Query
+
+FILE_PATH = 'Data Visualisasi UAS.xlsx'
+
+# Naikkan angka ini setiap kali logika cleaning berubah, supaya cache lama tidak terpakai
+CLEANING_VERSION = 2
+
+# --- DAFTAR SHEET ---
+# Data tetap: sama untuk halaman Framing maupun Real
+SHARED_SHEETS = ['Proyeksi Masa Depan', 'Trend Katastropik', 'Belanja Pensiun']
+
+FRAMING_SHEETS = ['Komparasi Gaji (Framing)', 'Korelasi Lansia (Framing)',
+                  'Benchmark Negara (Framing)', 'Analisis ROI (Framing)']
+
+REAL_SHEETS = ['Komparasi Gaji (Real)', 'Korelasi Lansia (Real)',
+               'Benchmark Negara (Real)', 'Analisis ROI (Real)']
+
+ALL_SHEETS = SHARED_SHEETS + FRAMING_SHEETS + REAL_SHEETS
+
+VARIANT_SHEETS = {'framing': FRAMING_SHEETS, 'real': REAL_SHEETS}
+
+# --- KEBUTUHAN DATA PER HALAMAN ---
+# Hanya kolom & rentang tahun ini yang diminta ke sumber data (filter dijalankan di storage).
+# UAS_HISTORY_YEARS: batasi tahun data historis yang dimuat, 'awal-akhir' (default kosong =
+# semua tahun). Slider "Rentang Tahun" di sidebar memilih di dalam rentang yang dimuat.
+# UAS_COUNTRIES: daftar Negara benchmark dipisah koma (kosong = semua negara).
+def _env_years(name):
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return None
+    start, _, end = value.partition('-')
+    return int(start), int(end or start)
+
+
+def _env_list(name):
+    values = tuple(v.strip() for v in os.environ.get(name, '').split(',') if v.strip())
+    return values or None
+
+
+HISTORY_YEARS = _env_years('UAS_HISTORY_YEARS')
+BENCHMARK_COUNTRIES = _env_list('UAS_COUNTRIES')
+
+SHARED_QUERIES = {
+    # Proyeksi tidak dibatasi HISTORY_YEARS: tahunnya proyeksi masa depan
+    'Proyeksi Masa Depan': Query(columns=('Tahun', 'Proyeksi Gaji DPR (Juta)', 'Proyeksi Kasus Korupsi')),
+    'Trend Katastropik': Query(columns=('Tahun', 'Biaya'), years=HISTORY_YEARS),
+    'Belanja Pensiun': Query(columns=('Tahun', 'Anggaran(Triliun)'), years=HISTORY_YEARS),
+}
+
+# --- PARSING PARALEL ---
+# UAS_LOAD_WORKERS: 'auto' (default, = jumlah core), 1 = selalu sekuensial, N = maksimal N proses.
+# Pool baru dipakai untuk workbook yang cukup besar; untuk workbook kecil biaya start
+# proses (import pandas/openpyxl di tiap worker) lebih mahal daripada parsing-nya.
+PARALLEL_MIN_BYTES = 1 << 20
+
+
+def workbook_hash(path=FILE_PATH):
+    """Hash isi file workbook (bukan mtime), dipakai sebagai key cache."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return f"{h.hexdigest()[:24]}-v{CLEANING_VERSION}"
+
+
+# --- FINGERPRINT PER SHEET (isi XML di dalam zip xlsx) ---
+# Hanya <sheetData> + shared string yang dirujuk sheet itu yang di-hash, jadi mengedit satu
+# sheet (atau sekadar memindah kursor / tab aktif) tidak membatalkan cache sheet lain.
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_SHEET_DATA = re.compile(rb'<sheetData[ >].*?</sheetData>|<sheetData/>', re.DOTALL)
+_SHARED_REF = re.compile(rb'<c\b[^>]*\bt="s"[^>]*>\s*<v>(\d+)</v>')
+_SHARED_ITEM = re.compile(rb'<si>(.*?)</si>', re.DOTALL)
+
+_fingerprint_memo = {}  # path -> ((mtime_ns, size), {sheet: fingerprint})
+_fingerprint_lock = threading.Lock()
+
+
+def _sheet_parts(zf):
+    """{nama sheet: path part XML} dari workbook.xml + relasinya."""
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{_NS_PKG}Relationship')}
+    parts = {}
+    for sheet in ET.fromstring(zf.read('xl/workbook.xml')).iter(f'{_NS_MAIN}sheet'):
+        target = targets[sheet.get(f'{_NS_REL}id')]
+        parts[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+    return parts
+
+
+def _compute_fingerprints(path):
+    with zipfile.ZipFile(path) as zf:
+        parts = _sheet_parts(zf)
+        names = set(zf.namelist())
+        shared = _SHARED_ITEM.findall(zf.read('xl/sharedStrings.xml')) if 'xl/sharedStrings.xml' in names else []
+        fingerprints = {}
+        for sheet_name, part in parts.items():
+            xml = zf.read(part)
+            match = _SHEET_DATA.search(xml)
+            data = match.group(0) if match else xml
+            h = hashlib.sha256(data)
+            for index in sorted({int(i) for i in _SHARED_REF.findall(data)}):
+                h.update(shared[index] if index < len(shared) else b'')
+            fingerprints[sheet_name] = f"{h.hexdigest()[:24]}-v{CLEANING_VERSION}"
+    return fingerprints
+
+
+def sheet_fingerprints(path=FILE_PATH):
+    """{nama sheet: fingerprint isi}. Dihitung ulang hanya kalau mtime/ukuran file berubah.
+
+    File yang bukan xlsx (zip) memakai hash seluruh file untuk semua sheet.
+    """
+    stat = os.stat(path)
+    token = (stat.st_mtime_ns, stat.st_size)
+    with _fingerprint_lock:
+        memo = _fingerprint_memo.get(path)
+    if memo is not None and memo[0] == token:
+        return memo[1]
+    with metrics.span('load.fingerprint'):
+        try:
+            fingerprints = _compute_fingerprints(path)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError):
+            whole = workbook_hash(path)
+            fingerprints = {name: whole for name in ALL_SHEETS}
+    with _fingerprint_lock:
+        _fingerprint_memo[path] = (token, fingerprints)
+    return fingerprints
+
+
+def fingerprint_version(fingerprints, sheet_names=ALL_SHEETS):
+    """Versi data gabungan beberapa sheet (berubah kalau salah satu sheet berubah)."""
+    h = hashlib.sha256()
+    for name in sheet_names:
+        h.update(f"{name}={fingerprints.get(name, '')};".encode())
+    return f"{h.hexdigest()[:24]}-v{CLEANING_VERSION}"
+
+
+# --- DATA CLEANING & PREPROCESSING (per sheet) ---
+def clean_sheet(sheet_name, df):
+    df.columns = df.columns.str.strip()  # Hapus spasi di nama kolom
+
+    # 1. Cleaning Proyeksi Masa Depan (df5)
+    if sheet_name == 'Proyeksi Masa Depan':
+        df = df.dropna(subset=['Tahun'])
+        df['Tahun'] = df['Tahun'].astype(int)
+
+        col_gaji = 'Proyeksi Gaji DPR'
+        if col_gaji in df.columns:
+            # Jika datanya masih dalam satuan Rupiah penuh (jutaan), bagi sejuta
+            if df[col_gaji].mean() > 1000000:
+                df[col_gaji] = df[col_gaji] / 1000000
+            df = df.rename(columns={col_gaji: 'Proyeksi Gaji DPR (Juta)'})
+
+    # 2. Cleaning Benchmark Negara (df3 - Baik Real & Framing)
+    elif sheet_name.startswith('Benchmark Negara'):
+        col_bench = 'Gaji Pejabat per Tahun'
+        if col_bench in df.columns:
+            if df[col_bench].max() > 1000000:
+                df[col_bench] = df[col_bench] / 1000000000
+            df = df.rename(columns={col_bench: 'Gaji Pejabat per Tahun (Miliar Rupiah)'})
+
+    # 3. Cleaning Trend (df_trend)
+    elif sheet_name == 'Trend Katastropik':
+        df['Tahun'] = pd.to_numeric(df['Tahun'], errors='coerce')
+        df['Biaya'] = pd.to_numeric(df['Biaya'], errors='coerce')
+        df = df.dropna()
+
+    # 4. Cleaning ROI (df_roi)
+    elif sheet_name.startswith('Analisis ROI'):
+        if 'Nominal' in df.columns:
+            df['Nominal'] = pd.to_numeric(df['Nominal'], errors='coerce')
+
+    # 5. Cleaning Lansia (df2)
+    elif sheet_name.startswith('Korelasi Lansia'):
+        df['Tahun'] = df['Tahun'].astype(int)
+
+    # 6. Cleaning Komparasi Gaji (df1): label mentah -> kategori kanonik (categorical)
+    elif sheet_name.startswith('Komparasi Gaji'):
+        df['Kategori'] = categoryMap.normalize(df['Kategori'])
+
+    return df
+
+
+def load_workers():
+    value = os.environ.get('UAS_LOAD_WORKERS', 'auto').strip().lower()
+    if value in ('', 'auto', '0'):
+        # sched_getaffinity menghormati limit CPU container, cpu_count() tidak
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+def _parse_sheets(path, sheet_names):
+    """Parse + clean beberapa sheet dengan satu handle Excel (dipanggil di worker)."""
+    frames = {}
+    with metrics.span('load.open_workbook'):
+        xls = pd.ExcelFile(path)
+    for name in sheet_names:
+        with metrics.span('load.read_excel'):
+            raw = pd.read_excel(xls, sheet_name=name)
+        with metrics.span('load.clean'):
+            frames[name] = clean_sheet(name, raw)
+    return frames
+
+
+def _parse_sheets_parallel(path, sheet_names, workers):
+    # Sheet dibagi round-robin ke tiap worker supaya file Excel cukup dibuka sekali per worker
+    chunks = [sheet_names[i::workers] for i in range(workers)]
+    # forkserver/spawn: aman dipanggil dari server Streamlit yang multi-thread (fork biasa tidak)
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    ctx = multiprocessing.get_context(method)
+    if method == 'forkserver':
+        ctx.set_forkserver_preload(['dataLoader'])
+
+    frames = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for result in pool.map(_parse_sheets, [path] * len(chunks), chunks):
+            frames.update(result)
+    return {name: frames[name] for name in sheet_names}
+
+
+def parse_sheets(sheet_names, path=FILE_PATH, workers=None):
+    """Parse & bersihkan sheet dari Excel, paralel kalau memungkinkan.
+
+    Kalau pool proses tidak bisa dibuat (container tanpa /dev/shm, limit proses, dll)
+    otomatis jatuh ke parsing sekuensial. Error di dalam sheet tetap dilempar apa adanya.
+    """
+    sheet_names = list(sheet_names)
+    workers = min(workers or load_workers(), len(sheet_names))
+    if workers > 1 and os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+        try:
+            return _parse_sheets_parallel(path, sheet_names, workers)
+        except (OSError, BrokenProcessPool):
+            pass
+    return _parse_sheets(path, sheet_names)
+
+
+def read_sheets(sheet_names, path=FILE_PATH, key=None, workers=None, queries=None):
+    """Return dict {nama sheet: DataFrame bersih}.
+
+    Sheet yang sudah ada di cache kolumnar dibaca langsung (tanpa openpyxl);
+    sisanya di-parse dari Excel, dibersihkan, lalu ditulis ke cache (utuh).
+    Key cache = fingerprint per sheet, jadi setelah workbook diedit hanya sheet
+    yang isinya berubah yang di-parse ulang. `key` mengganti key semua sheet.
+    queries: dict {nama sheet: Query} opsional, diterapkan pada hasil.
+    """
+    keys = {name: key for name in sheet_names} if key else sheet_fingerprints(path)
+    queries = queries or {}
+    frames = {}
+    missing = []
+    for name in sheet_names:
+        with metrics.span('load.cache_read'):
+            df = sheetCache.read(keys[name], name, queries.get(name))
+        if df is None:
+            missing.append(name)
+        else:
+            frames[name] = df
+
+    if missing:
+        parsed = parse_sheets(missing, path, workers)
+        for name in missing:
+            sheetCache.write(keys[name], name, parsed[name])
+            frames[name] = dataSources.filter_frame(parsed[name], queries.get(name))
+
+    return frames
+
+
+# --- SUMBER DATA ---
+class ExcelSource(dataSources.Source):
+    """Workbook Excel. Excel tidak bisa difilter saat dibaca, jadi filter jalan di cache Arrow
+    (sebelum konversi ke pandas) atau di memori setelah parsing pertama."""
+    name = 'excel'
+
+    def __init__(self, path=FILE_PATH):
+        self.path = path
+        self.failed = {}  # nama sheet -> (fingerprint, pesan error) parsing terakhir yang gagal
+
+    def version(self):
+        return fingerprint_version(sheet_fingerprints(self.path))
+
+    def prepare(self):
+        """Parse sheet yang fingerprint-nya belum ada di cache (= yang berubah). Return nama sheet.
+
+        Sheet yang gagal di-parse tidak menahan sheet lain: yang berhasil tetap di-cache, yang
+        gagal dicatat di self.failed dan tidak dicoba lagi sampai isinya berubah. Halaman yang
+        memakai sheet itu menampilkan error load-nya sendiri.
+        """
+        if not sheetCache.enabled():
+            return []
+        fingerprints = sheet_fingerprints(self.path)
+        changed = [name for name in ALL_SHEETS
+                   if not sheetCache.exists(fingerprints[name], name)
+                   and self.failed.get(name, (None,))[0] != fingerprints[name]]
+        if not changed:
+            return []
+        try:
+            parsed = parse_sheets(changed, self.path)
+        except Exception:
+            # Parse ulang satu per satu supaya sheet yang rusak bisa dipisahkan
+            parsed = {}
+            for name in changed:
+                try:
+                    parsed.update(_parse_sheets(self.path, [name]))
+                except Exception as e:
+                    self.failed[name] = (fingerprints[name], str(e))
+        for name, df in parsed.items():
+            sheetCache.write(fingerprints[name], name, df)
+            self.failed.pop(name, None)
+        return list(parsed)
+
+    def read(self, sheet_name, query=None):
+        return self.read_many({sheet_name: query})[sheet_name]
+
+    def read_many(self, queries):
+        # Satu panggilan read_sheets: workbook dibuka sekali (atau paralel) untuk semua sheet
+        return read_sheets(list(queries), self.path, queries=queries)
+
+
+def open_source(spec):
+    """'excel[:path]', 'parquet:folder', atau 'sqlite:file.db' -> objek sumber data."""
+    kind, _, location = spec.partition(':')
+    kind = kind.strip().lower()
+    if kind in ('', 'excel'):
+        return ExcelSource(location or FILE_PATH)
+    if kind == 'parquet':
+        return dataSources.ParquetSource(location)
+    if kind == 'sqlite':
+        return dataSources.SQLiteSource(location)
+    raise ValueError(f"UAS_DATA_SOURCE tidak dikenal: {spec!r}")
+
+
+def source_from_env():
+    # UAS_DATA_SOURCE: kosong = workbook Excel bawaan
+    return open_source(os.environ.get('UAS_DATA_SOURCE', ''))
+
+
+def variant_queries(variant, years=HISTORY_YEARS, countries=BENCHMARK_COUNTRIES):
+    # Korelasi Lansia dimuat sebatas HISTORY_YEARS; rentang tampil dipilih di sidebar
+    # dan dipotong per rerun lewat timeSeries.year_slice
+    komparasi, lansia, benchmark, roi = VARIANT_SHEETS[variant]
+    return {
+        komparasi: Query(columns=('Kategori', 'Nominal')),
+        lansia: Query(columns=('Tahun', 'Jumlah Lansia (Juta Jiwa)', 'Skor Indeks Korupsi (CPI)'),
+                      years=years),
+        benchmark: Query(columns=('Negara', 'Gaji Pejabat per Tahun (Miliar Rupiah)', 'Skor Kebersihan (CPI)'),
+                         countries=countries),
+        roi: Query(columns=('Komponen', 'Nominal')),
+    }
+
+
+def check_columns(frames, queries):
+    """Pastikan semua kolom Query ada di frame hasil baca.
+
+    Query membuang kolom yang tidak ada tanpa error; di sini kolom yang hilang (sheet diedit,
+    nama kolom berubah) langsung gagal saat load, bukan di tengah render halaman.
+    """
+    for name, query in queries.items():
+        df = frames.get(name)
+        if df is None or query.columns is None:
+            continue
+        missing = [col for col in query.columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Sheet '{name}': kolom {missing} tidak ada")
+    return frames
+
+
+def load_shared(source=None, compact=True):
+    """Sheet bersama (df5, df_trend, df_pensiun) siap pakai: diringkas, urut Tahun, + kolom turunan."""
+    if source is None or isinstance(source, str):
+        source = ExcelSource(source or FILE_PATH)
+    shared = check_columns(source.read_many(SHARED_QUERIES), SHARED_QUERIES)
+    if compact:
+        shared = frameCompact.compact_frames(shared)
+    return derivedColumns.derive_frames(timeSeries.sort_frames(shared))
+
+
+def load_pack(variant, source=None, shared=None, compact=True):
+    """Bangun data pack satu halaman ('framing' / 'real').
+
+    Hanya sheet bersama + 4 sheet milik varian tersebut yang dibaca, jadi sheet
+    rusak di varian lain tidak ikut memblokir halaman ini. `source` boleh objek
+    sumber data atau path workbook (default: workbook Excel bawaan).
+    compact=True: dtype diringkas lewat frameCompact (frame yang sudah ringkas tidak disalin).
+    Kolom turunan (derivedColumns.SCHEMA) ikut dihitung di sini; `shared` dari load_shared
+    sudah membawanya.
+    Urutan Pack: df1, df2, df3, df4, df5, df_roi, df_trend, df_pensiun
+    """
+    if source is None or isinstance(source, str):
+        source = ExcelSource(source or FILE_PATH)
+    if shared is None:
+        shared = load_shared(source, compact)
+    queries = variant_queries(variant)
+    frames = check_columns(source.read_many(queries), queries)
+    if compact:
+        frames = frameCompact.compact_frames(frames)
+    frames = derivedColumns.derive_frames(timeSeries.sort_frames(frames))
+
+    df1, df2, df3, df_roi = (frames[name] for name in VARIANT_SHEETS[variant])
+    df5 = shared['Proyeksi Masa Depan']
+    df_trend = shared['Trend Katastropik']
+    df_pensiun = shared['Belanja Pensiun']
+
+    # Porsi BPJS di-skip (None) sesuai request
+    df4 = None
+
+    return (df1, df2, df3, df4, df5, df_roi, df_trend, df_pensiun)
@@ -0,0 +1,223 @@
+"""Sumber data dashboard: Excel (default), Parquet, atau SQLite.
+
+Setiap sumber menerima Query per sheet (kolom yang dibutuhkan, rentang Tahun, daftar Negara)
+dan sebisa mungkin menjalankan filter di storage, jadi memori & waktu load mengikuti jumlah
+baris yang ditampilkan, bukan jumlah baris yang disimpan.
+
+Konversi workbook ke Parquet / SQLite (data sudah dibersihkan oleh dataLoader):
+    python dataSources.py parquet data/parquet
+    python dataSources.py sqlite data/dashboard.db
+
+Lalu jalankan app dengan UAS_DATA_SOURCE=parquet:data/parquet atau sqlite:data/dashboard.db.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+from typing import NamedTuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Tanpa pyarrow: Excel & SQLite tetap jalan, Parquet tidak tersedia
+    pa = None
+
+# Kolom yang dikenali untuk filter baris
+YEAR_COLUMN = 'Tahun'
+COUNTRY_COLUMN = 'Negara'
+
+# Ukuran row group Parquet: statistik min/max per group dipakai untuk melompati data
+ROW_GROUP_ROWS = 64 * 1024
+
+
+class Query(NamedTuple):
+    columns: tuple = None    # None = semua kolom
+    years: tuple = None      # (awal, akhir) inklusif pada kolom Tahun
+    countries: tuple = None  # nilai kolom Negara yang diambil
+
+
+def sheet_slug(sheet_name):
+    return ''.join(c if c.isalnum() else '_' for c in sheet_name).strip('_')
+
+
+# --- FILTER (dipakai semua sumber) ---
+def filter_frame(df, query):
+    """Terapkan Query pada DataFrame yang sudah ada di memori (fallback untuk Excel)."""
+    if query is None or df is None:
+        return df
+    mask = None
+    if query.years is not None and YEAR_COLUMN in df.columns:
+        mask = df[YEAR_COLUMN].between(*query.years)
+    if query.countries is not None and COUNTRY_COLUMN in df.columns:
+        in_countries = df[COUNTRY_COLUMN].isin(query.countries)
+        mask = in_countries if mask is None else mask & in_countries
+    if mask is not None:
+        df = df[mask].reset_index(drop=True)
+    if query.columns is not None:
+        df = df[[c for c in query.columns if c in df.columns]]
+    return df
+
+
+def arrow_filter(query, names):
+    """Expression pyarrow untuk filter baris Query, atau None kalau tidak ada filter."""
+    expr = None
+    if query.years is not None and YEAR_COLUMN in names:
+        expr = (pc.field(YEAR_COLUMN) >= query.years[0]) & (pc.field(YEAR_COLUMN) <= query.years[1])
+    if query.countries is not None and COUNTRY_COLUMN in names:
+        in_countries = pc.field(COUNTRY_COLUMN).isin(list(query.countries))
+        expr = in_countries if expr is None else expr & in_countries
+    return expr
+
+
+def filter_table(table, query):
+    """Terapkan Query pada tabel Arrow sebelum dikonversi ke pandas."""
+    if query is None:
+        return table
+    names = table.schema.names
+    expr = arrow_filter(query, names)
+    if expr is not None:
+        table = table.filter(expr)
+    if query.columns is not None:
+        table = table.select([c for c in query.columns if c in names])
+    return table
+
+
+# --- SUMBER DATA ---
+class Source:
+    """Antarmuka sumber data: version() untuk key cache, read() per sheet."""
+    name = 'source'
+
+    def version(self):
+        raise NotImplementedError
+
+    def read(self, sheet_name, query=None):
+        raise NotImplementedError
+
+    def prepare(self):
+        """Dipanggil watcher sebelum versi baru dipublikasikan (mis. isi cache). Return sheet yang diproses."""
+        return []
+
+    def read_many(self, queries):
+        """queries: dict {nama sheet: Query}. Return dict {nama sheet: DataFrame}."""
+        return {name: self.read(name, query) for name, query in queries.items()}
+
+
+def _stat_version(prefix, paths):
+    h = hashlib.sha256()
+    for path in sorted(paths):
+        st = os.stat(path)
+        h.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return f"{prefix}-{h.hexdigest()[:24]}"
+
+
+class ParquetSource(Source):
+    """Satu file <slug>.parquet per sheet; filter & proyeksi kolom dijalankan oleh pyarrow."""
+    name = 'parquet'
+
+    def __init__(self, directory):
+        if pa is None:
+            raise ImportError("Sumber Parquet membutuhkan pyarrow")
+        self.directory = directory
+
+    def _path(self, sheet_name):
+        return os.path.join(self.directory, f"{sheet_slug(sheet_name)}.parquet")
+
+    def version(self):
+        files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith('.parquet')]
+        return _stat_version('parquet', files)
+
+    def read(self, sheet_name, query=None):
+        path = self._path(sheet_name)
+        if query is None:
+            return pq.read_table(path).to_pandas()
+        names = pq.read_schema(path).names
+        columns = None if query.columns is None else [c for c in query.columns if c in names]
+        # filters -> row group yang min/max-nya di luar rentang tidak dibaca sama sekali
+        table = pq.read_table(path, columns=columns, filters=arrow_filter(query, names))
+        return table.to_pandas()
+
+
+class SQLiteSource(Source):
+    """Satu tabel per sheet (nama tabel = nama sheet); filter jadi klausa WHERE."""
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def version(self):
+        return _stat_version('sqlite', [self.path])
+
+    def read(self, sheet_name, query=None):
+        query = query or Query()
+        with self._connect() as conn:
+            names = [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(sheet_name)})")]
+            if not names:
+                raise ValueError(f"Tabel '{sheet_name}' tidak ada di {self.path}")
+            columns = names if query.columns is None else [c for c in query.columns if c in names]
+
+            where, params = [], []
+            if query.years is not None and YEAR_COLUMN in names:
+                where.append(f"{_quote(YEAR_COLUMN)} BETWEEN ? AND ?")
+                params.extend(query.years)
+            if query.countries is not None and COUNTRY_COLUMN in names:
+                where.append(f"{_quote(COUNTRY_COLUMN)} IN ({', '.join('?' * len(query.countries))})")
+                params.extend(query.countries)
+
+            sql = f"SELECT {', '.join(_quote(c) for c in columns)} FROM {_quote(sheet_name)}"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY rowid"  # urutan baris sama dengan sheet aslinya, walau index dipakai
+            return pd.read_sql_query(sql, conn, params=params)
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# --- EXPORT (workbook -> Parquet / SQLite) ---
+def export_parquet(frames, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, df in frames.items():
+        if YEAR_COLUMN in df.columns:
+            # Urut per tahun supaya statistik row group rapat dan filter tahun bisa melompati group
+            df = df.sort_values(YEAR_COLUMN, kind='stable')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, os.path.join(directory, f"{sheet_slug(name)}.parquet"),
+                       row_group_size=ROW_GROUP_ROWS)
+
+
+def export_sqlite(frames, path):
+    with sqlite3.connect(path) as conn:
+        for name, df in frames.items():
+            df.to_sql(name, conn, if_exists='replace', index=False)
+            for col in (YEAR_COLUMN, COUNTRY_COLUMN):
+                if col in df.columns:
+                    index_name = _quote(f"idx_{sheet_slug(name)}_{col}")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_quote(name)} ({_quote(col)})")
+
+
+def main():
+    import dataLoader
+
+    parser = argparse.ArgumentParser(description="Konversi workbook Excel (sudah dibersihkan) ke Parquet / SQLite.")
+    parser.add_argument('format', choices=['parquet', 'sqlite'])
+    parser.add_argument('target', help="Folder (parquet) atau file .db (sqlite)")
+    parser.add_argument('--workbook', default=dataLoader.FILE_PATH)
+    args = parser.parse_args()
+
+    frames = dataLoader.read_sheets(dataLoader.ALL_SHEETS, args.workbook)
+    if args.format == 'parquet':
+        export_parquet(frames, args.target)
+    else:
+        export_sqlite(frames, args.target)
+    print(f"{len(frames)} sheet ditulis ke {args.target}")
+
+
+if __name__ == '__main__':
+    main()
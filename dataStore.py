@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# --- DATA STORE (process-wide, read-only, tanpa salinan per rerun) ---
+# st.cache_data mem-pickle ulang data pack di setiap akses (tiap rerun tiap sesi). Di sini
+# frame disimpan sekali per proses dengan buffer numpy read-only, lalu setiap rerun mendapat
+# view dangkal (copy(deep=False)): O(jumlah kolom), tanpa menyalin data.
+# Dengan copy-on-write pandas, mutasi di halaman (mis. df_trend['Biaya_Triliun'] = ...)
+# hanya mengenai view milik rerun itu; tulisan langsung ke buffer numpy ditolak (read-only).
+# Key: (nama, data_version). Versi data baru untuk nama yang sama membuang versi lama.
+_frames = {}
+_lock = threading.Lock()
+
+
+def freeze(df):
+    """Frame dengan buffer numpy read-only (kolom extension/Arrow memang immutable)."""
+    if df is None:
+        return None
+    columns = {}
+    for name in df.columns:
+        col = df[name]
+        # Kolom yang sudah read-only (mis. frame bersama dari store) dipakai apa adanya
+        if isinstance(col.dtype, np.dtype) and np.asarray(col.array).flags.writeable:
+            values = np.array(col.to_numpy())
+            values.flags.writeable = False
+            col = pd.Series(values, index=df.index, name=name, copy=False)
+        columns[name] = col
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def view(obj):
+    """View dangkal per rerun: frame, tuple/list frame, atau dict frame."""
+    if isinstance(obj, pd.DataFrame):
+        return obj.copy(deep=False)
+    if isinstance(obj, dict):
+        return {name: view(value) for name, value in obj.items()}
+    if isinstance(obj, (tuple, list)):
+        return type(obj)(view(value) for value in obj)
+    return obj
+
+
+def _freeze_all(obj):
+    if isinstance(obj, pd.DataFrame):
+        return freeze(obj)
+    if isinstance(obj, dict):
+        return {name: _freeze_all(value) for name, value in obj.items()}
+    if isinstance(obj, (tuple, list)):
+        return type(obj)(_freeze_all(value) for value in obj)
+    return obj
+
+
+def get(key, loader):
+    """Isi store untuk key (dibangun sekali lewat loader); return view baru yang aman diubah."""
+    stored = _frames.get(key)
+    if stored is None:
+        with metrics.span(f'store.load.{key[0]}'):
+            stored = _freeze_all(loader())
+        with _lock:
+            name, data_version = key
+            for old_key in [k for k in _frames if k[0] == name and k[1] != data_version]:
+                del _frames[old_key]
+            # Sesi lain mungkin selesai lebih dulu: pakai yang sudah tersimpan
+            stored = _frames.setdefault(key, stored)
+    return view(stored)
+
+
+def clear():
+    with _lock:
+        _frames.clear()
@@ -0,0 +1,74 @@
+from typing import Callable, NamedTuple
+
+import numberFormat
+
+# --- KOLOM TURUNAN (dihitung sekali per versi data, bukan per rerun) ---
+# Skema per sheet: kolom turunan, kolom sumber yang wajib ada, dan cara menghitungnya.
+# Kolom sumber yang hilang langsung gagal saat load (ValueError), bukan di tengah render halaman.
+# compute menerima frame atau dict {kolom: array} (dipakai scenarioEngine per skenario).
+
+COL_GAJI_PROYEKSI = 'Proyeksi Gaji DPR (Juta)'
+
+
+class Derived(NamedTuple):
+    column: str
+    requires: tuple
+    compute: Callable
+
+
+def _persen_naik(df):
+    # Kenaikan kumulatif (%) terhadap baris pertama; baris terakhir = angka "Naik +x%"
+    anggaran = df['Anggaran(Triliun)']
+    return (anggaran - anggaran.iloc[0]) / anggaran.iloc[0] * 100
+
+
+# Urutan dalam satu sheet penting: kolom turunan boleh memakai kolom turunan sebelumnya
+SCHEMA = {
+    'Trend Katastropik': (
+        Derived('Biaya_Triliun', ('Biaya',), lambda df: df['Biaya'] / 1_000_000_000_000),
+    ),
+    'Belanja Pensiun': (
+        Derived('Persen_Naik', ('Anggaran(Triliun)',), _persen_naik),
+    ),
+    'Proyeksi Masa Depan': (
+        Derived('Gaji_Miliar', (COL_GAJI_PROYEKSI,), lambda df: df[COL_GAJI_PROYEKSI] / 1000),
+    ),
+    'Komparasi Gaji (Framing)': (
+        Derived('Label_Text', ('Nominal',), lambda df: numberFormat.format_values(df['Nominal'], numberFormat.RUPIAH)),
+    ),
+    'Komparasi Gaji (Real)': (
+        Derived('Label_Text', ('Nominal',), lambda df: numberFormat.format_values(df['Nominal'], numberFormat.JUTA)),
+    ),
+}
+
+
+def derive(sheet_name, df):
+    """Frame + kolom turunan sheet ini (frame asli tidak diubah)."""
+    entries = SCHEMA.get(sheet_name, ())
+    if df is None or not entries:
+        return df
+    df = df.copy(deep=False)
+    for entry in entries:
+        missing = [col for col in entry.requires if col not in df.columns]
+        if missing:
+            raise ValueError(f"Sheet '{sheet_name}': kolom {missing} tidak ada "
+                             f"(dibutuhkan untuk kolom turunan '{entry.column}')")
+        df[entry.column] = entry.compute(df)
+    return df
+
+
+def derive_frames(frames):
+    return {name: derive(name, df) for name, df in frames.items()}
+
+
+def recompute(sheet_name, columns, changed):
+    """Hitung ulang kolom turunan yang bergantung (langsung/tidak) pada kolom `changed`.
+
+    columns: dict {kolom: array}, diubah di tempat. Dipakai scenarioEngine setelah gaji dikali multiplier.
+    """
+    changed = {changed}
+    for entry in SCHEMA.get(sheet_name, ()):
+        if changed.intersection(entry.requires):
+            columns[entry.column] = entry.compute(columns)
+            changed.add(entry.column)
+    return columns
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# --- DOWNSAMPLING DERET WAKTU ---
+# Batas titik per trace sebelum data dikirim ke Plotly. Default kira-kira lebar chart dalam
+# piksel (kolom dashboard ~700-1400 px): titik lebih rapat dari itu tidak terlihat di layar.
+# UAS_MAX_POINTS mengganti batas untuk garis; batang memakai setengahnya (2 titik per bucket).
+LINE_POINTS = int(os.environ.get('UAS_MAX_POINTS', '1000'))
+BAR_POINTS = LINE_POINTS // 2
+
+# Cache indeks hasil reduksi: key = isi kolom (hash) + metode + batas titik
+CACHE_SIZE = 64
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: return indeks titik terpilih (urut, termasuk ujung)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Titik pertama & terakhir selalu ikut; sisanya dibagi ke n_out - 2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Rata-rata tiap bucket dihitung sekaligus (dipakai sebagai titik C bucket sebelumnya)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Luas segitiga (a, kandidat, rata-rata bucket berikutnya), tanpa faktor 1/2
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x, y, n_out):
+    """Min/max per bucket (untuk batang): puncak & lembah tiap bucket tetap terlihat."""
+    n = len(x)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    # Bucket selebar `width` titik berurutan; baris terakhir diisi NaN supaya bisa di-reshape
+    width = -(-n // (n_out // 2))
+    rows = -(-n // width)
+    padded = np.full(rows * width, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(rows, width)
+    offsets = np.arange(rows) * width
+    picked = np.concatenate([offsets + np.nanargmin(grid, axis=1), offsets + np.nanargmax(grid, axis=1)])
+    return np.unique(picked)
+
+
+METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+def _digest(values):
+    return hashlib.blake2b(np.ascontiguousarray(values).view(np.uint8), digest_size=16).digest()
+
+
+def _numeric(series):
+    values = series.to_numpy()
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def indices(x, y, method='lttb', max_points=None):
+    """Indeks baris yang dipertahankan untuk satu deret (hasil di-cache per isi data)."""
+    max_points = max_points or (LINE_POINTS if method == 'lttb' else BAR_POINTS)
+    if len(x) <= max_points:
+        return None
+    key = (method, max_points, _digest(x), _digest(y))
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+    # NaN tidak bisa dibandingkan luas/min-max-nya: tidak ikut dipilih
+    valid = np.flatnonzero(np.isfinite(y))
+    picked = valid[METHODS[method](x[valid], y[valid], max_points)]
+    with _lock:
+        _cache[key] = picked
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return picked
+
+
+def frame(df, x, y_cols, method='lttb', max_points=None):
+    """Kurangi baris df untuk trace Plotly. df harus urut menurut kolom x.
+
+    Tiap kolom y direduksi sendiri lalu indeksnya digabung, jadi bentuk setiap
+    trace tetap terjaga. df kecil (<= batas titik) dikembalikan apa adanya.
+    """
+    if len(df) <= (max_points or (LINE_POINTS if method == 'lttb' else BAR_POINTS)):
+        return df
+    x_values = _numeric(df[x])
+    keep = [indices(x_values, _numeric(df[col]), method, max_points) for col in y_cols]
+    return df.take(np.unique(np.concatenate(keep)))
+
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,242 @@
+"""Prerender kedua dashboard menjadi HTML statis (tanpa sesi Streamlit per pengunjung).
+
+Halaman di-render headless lewat AppTest Streamlit, jadi isinya persis sama dengan app.py
+(load_data, framingData, ethicalData dipakai apa adanya). Setiap nilai slider
+"Multiplier Kebijakan" ikut di-embed; pergantian nilai terjadi di browser.
+
+Pemakaian:
+    python exportStatic.py --out dist
+    python exportStatic.py --out dist --inline-plotlyjs   # satu file HTML per halaman
+"""
+import argparse
+import html
+import json
+import os
+import re
+import time
+
+from plotly.offline import get_plotlyjs
+from streamlit.testing.v1 import AppTest
+
+import scenarioEngine
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# (label radio di sidebar app.py, nama file output)
+PAGES = [
+    ("Dashboard Framing (Manipulasi)", 'framing.html'),
+    ("Data Sebenarnya (Jujur)", 'real.html'),
+]
+
+PLOTLY_CONFIG = {'responsive': True, 'displaylogo': False}
+
+LAYOUT_CSS = """
+body { margin: 0; font-family: 'Inter', sans-serif; }
+.block-container { max-width: 1400px; margin: 0 auto; padding: 2rem 1rem; }
+.row { display: flex; gap: 1rem; }
+.col { flex: 1 1 0; min-width: 0; }
+.panel { border: 1px solid #333; border-radius: 8px; padding: 1rem; margin-bottom: 1rem; }
+.alert { padding: 0.75rem 1rem; border-radius: 8px; margin: 0.5rem 0; }
+.alert-error { background: rgba(255, 43, 43, 0.15); }
+.alert-info { background: rgba(28, 131, 225, 0.15); }
+.alert-success { background: rgba(33, 195, 84, 0.15); }
+.alert-warning { background: rgba(255, 193, 7, 0.15); }
+input[type=range] { width: 100%; }
+button { background: #262730; color: #FFF; border: 1px solid #555; border-radius: 6px; padding: 0.4rem 0.9rem; cursor: pointer; }
+nav a { color: #4A90E2; margin-right: 1.5rem; }
+"""
+
+ALERT_CLASS = {1: 'alert-error', 2: 'alert-warning', 3: 'alert-info', 4: 'alert-success'}
+
+
+def _script_json(obj):
+    # '</' di dalam <script> harus di-escape supaya tidak menutup tag script
+    return json.dumps(obj, ensure_ascii=False).replace('</', '<\\/')
+
+
+def _markdown_html(text):
+    text = text.strip()
+    if text == '---':
+        return '<hr>'
+    heading = re.match(r'^(#{1,6})\s+(.*)$', text)
+    if heading and '\n' not in text:
+        level = len(heading.group(1))
+        return f'<h{level}>{html.escape(heading.group(2))}</h{level}>'
+    # Markdown di dashboard ini berisi HTML mentah (unsafe_allow_html=True)
+    return f'<div class="md">{text}</div>'
+
+
+def _element_html(node):
+    """Return (html, plotly_spec). plotly_spec terisi hanya untuk chart."""
+    kind = getattr(node, 'type', '')
+    proto = getattr(node, 'proto', None)
+    if kind == 'plotly_chart':
+        return None, proto.spec
+    if kind == 'markdown':
+        return _markdown_html(node.value), None
+    if kind in ('title', 'header', 'subheader'):
+        tag = proto.tag or {'title': 'h1', 'header': 'h2', 'subheader': 'h3'}[kind]
+        return f'<{tag}>{html.escape(proto.body)}</{tag}>', None
+    if kind in ('error', 'warning', 'info', 'success', 'alert'):
+        return f'<div class="alert {ALERT_CLASS.get(proto.format, "alert-info")}">{html.escape(proto.body)}</div>', None
+    if kind == 'slider':
+        return '<input type="range" class="multiplier" min="0" max="{}" step="1">'.format(len(scenarioEngine.MULTIPLIERS) - 1) \
+            + f'<div><b>{html.escape(node.label)}</b> <span class="multiplier-value"></span></div>', None
+    if kind == 'button':
+        return f'<button class="reset">{html.escape(node.label)}</button>', None
+    return '', None
+
+
+class _Renderer:
+    """Gabungkan tree AppTest untuk semua nilai slider menjadi satu dokumen HTML."""
+
+    def __init__(self):
+        self.figures = {}   # id -> [spec per nilai slider] (atau 1 spec kalau sama)
+        self.switches = {}  # id -> [html per nilai slider]
+        self.counter = 0
+
+    def _next_id(self, prefix):
+        self.counter += 1
+        return f'{prefix}{self.counter}'
+
+    def block(self, nodes):
+        first = nodes[0]
+        children = getattr(first, 'children', None)
+        if children is None:
+            return self.leaf(nodes)
+
+        inner = ''.join(self.block([n.children[k] for n in nodes]) for k in sorted(children))
+        kind = getattr(first, 'type', '')
+        if kind == 'column':
+            return f'<div class="col">{inner}</div>'
+        if any(getattr(first.children[k], 'type', '') == 'column' for k in children):
+            return f'<div class="row">{inner}</div>'
+        if getattr(first.proto, 'flex_container', None) and first.proto.flex_container.border:
+            return f'<div class="panel">{inner}</div>'
+        return f'<div>{inner}</div>'
+
+    def leaf(self, nodes):
+        rendered = [_element_html(n) for n in nodes]
+        htmls = [r[0] for r in rendered]
+        specs = [r[1] for r in rendered]
+        if specs[0] is not None:
+            fig_id = self._next_id('fig')
+            parsed = [json.loads(s) for s in specs]
+            self.figures[fig_id] = parsed if len(set(specs)) > 1 else parsed[:1]
+            return f'<div id="{fig_id}" class="chart"></div>'
+        if len(set(htmls)) > 1:
+            switch_id = self._next_id('sw')
+            self.switches[switch_id] = htmls
+            return f'<div id="{switch_id}">{htmls[0]}</div>'
+        return htmls[0]
+
+
+def render_page(label, timeout=120):
+    """Jalankan app.py headless untuk satu halaman dan semua nilai slider."""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    at.sidebar.radio[0].set_value(label).run()
+
+    trees = []
+    for factor in scenarioEngine.MULTIPLIERS:
+        slider = next(s for s in at.slider if s.label.startswith('Multiplier'))
+        slider.set_value(factor).run()
+        if at.exception:
+            raise RuntimeError(f"Render '{label}' gagal ({factor}x): {at.exception[0].message}")
+        trees.append(at.main)
+    return trees
+
+
+def build_html(label, trees, plotly_js_tag):
+    renderer = _Renderer()
+    body = ''.join(renderer.block([t.children[k] for t in trees]) for k in sorted(trees[0].children))
+    nav = ''.join(f'<a href="{fname}">{html.escape(lbl)}</a>' for lbl, fname in PAGES)
+    default_index = scenarioEngine.MULTIPLIERS.index(1.0)
+
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(label)}</title>
+{plotly_js_tag}
+<style>{LAYOUT_CSS}</style>
+</head>
+<body class="stApp">
+<div class="block-container">
+<nav>{nav}</nav>
+{body}
+</div>
+<script>
+const MULTIPLIERS = {_script_json(list(scenarioEngine.MULTIPLIERS))};
+const FIGURES = {_script_json(renderer.figures)};
+const SWITCHES = {_script_json(renderer.switches)};
+const CONFIG = {_script_json(PLOTLY_CONFIG)};
+
+function draw(id, fig, first) {{
+    (first ? Plotly.newPlot : Plotly.react)(id, fig.data, fig.layout, CONFIG);
+}}
+
+function setMultiplier(i, first) {{
+    for (const [id, states] of Object.entries(FIGURES)) {{
+        if (first || states.length > 1) draw(id, states[Math.min(i, states.length - 1)], first);
+    }}
+    for (const [id, states] of Object.entries(SWITCHES)) {{
+        document.getElementById(id).innerHTML = states[i];
+    }}
+    document.querySelectorAll('input.multiplier').forEach(el => el.value = i);
+    document.querySelectorAll('.multiplier-value').forEach(el => el.textContent = MULTIPLIERS[i].toFixed(1) + 'x');
+}}
+
+document.querySelectorAll('input.multiplier').forEach(el =>
+    el.addEventListener('input', () => setMultiplier(parseInt(el.value, 10), false)));
+document.querySelectorAll('button.reset').forEach(el =>
+    el.addEventListener('click', () => setMultiplier({default_index}, false)));
+setMultiplier({default_index}, true);
+</script>
+</body>
+</html>
+"""
+
+
+def export(out_dir, inline_plotlyjs=False):
+    os.makedirs(out_dir, exist_ok=True)
+    if inline_plotlyjs:
+        plotly_js_tag = f'<script>{get_plotlyjs()}</script>'
+    else:
+        # Satu plotly.min.js dipakai bersama semua halaman (di-cache browser / CDN)
+        with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        plotly_js_tag = '<script src="plotly.min.js"></script>'
+
+    written = []
+    for label, fname in PAGES:
+        trees = render_page(label)
+        path = os.path.join(out_dir, fname)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(build_html(label, trees, plotly_js_tag))
+        written.append(path)
+
+    # index.html diarahkan ke halaman pertama
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={PAGES[0][1]}">')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dashboard sebagai HTML statis untuk semua nilai slider.")
+    parser.add_argument('--out', default='dist', help="Folder output (default: dist)")
+    parser.add_argument('--inline-plotlyjs', action='store_true',
+                        help="Tanam plotly.js di setiap halaman (file mandiri, lebih besar)")
+    args = parser.parse_args()
+
+    # Export sudah menanam semua nilai slider sendiri; pakai slider Streamlit biasa saat render
+    os.environ['UAS_CLIENT_SLIDER'] = '0'
+    start = time.perf_counter()
+    for path in export(args.out, args.inline_plotlyjs):
+        print(f"Tulis {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    print(f"Selesai dalam {time.perf_counter() - start:.1f} detik")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import os
+import threading
+from collections import OrderedDict
+
+import figureStore
+import metrics
+
+# --- CACHE FIGURE (process-wide, dipakai bersama semua sesi) ---
+# Key: (data_version, page, chart, simulation_factor). Chart yang tidak bergantung pada
+# slider memakai simulation_factor=None, jadi cukup dibangun sekali per versi data.
+# Figure yang disimpan tidak pernah diubah: st.plotly_chart selalu bekerja pada
+# salinan (fig.to_dict()), jadi aman dibagi antar sesi.
+# Miss di memori dicek dulu ke figureStore (SQLite di disk, dibagi semua proses/restart)
+# sebelum builder dijalankan.
+# Rentang tahun ikut key chart tren, jadi jumlah entri dibatasi MAX_FIGURES (LRU): figure
+# yang paling lama tidak dipakai dibuang lebih dulu (masih ada di figureStore).
+MAX_FIGURES = int(os.environ.get('UAS_FIGURE_CACHE_SIZE', '512'))
+
+_figures = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_figure(key, builder):
+    fig = _figures.get(key)
+    if fig is not None:
+        with _lock:
+            if key in _figures:
+                _figures.move_to_end(key)
+    else:
+        fig = figureStore.load(key)
+        if fig is None:
+            with metrics.span(f'figure.build.{key[1]}.{key[2]}'):
+                fig = builder()
+            figureStore.save(key, fig)
+        with _lock:
+            data_version, page = key[0], key[1]
+            # Versi data baru untuk halaman ini: buang figure versi lama supaya memori tidak tumbuh
+            for old_key in [k for k in _figures if k[1] == page and k[0] != data_version]:
+                del _figures[old_key]
+            _figures[key] = fig
+            while len(_figures) > MAX_FIGURES:
+                _figures.popitem(last=False)
+    return fig
+
+
+def clear():
+    with _lock:
+        _figures.clear()
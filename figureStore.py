@@ -0,0 +1,146 @@
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import plotly
+import plotly.io as pio
+
+import metrics
+
+# --- CACHE FIGURE DI DISK (SQLite, dibagi semua proses di host) ---
+# Lapis kedua di bawah figureCache: figure yang sudah pernah dibangun untuk versi data,
+# halaman, chart, dan parameter yang sama dimuat dari JSON, bukan dibangun ulang, termasuk
+# setelah restart atau di worker lain. Ukuran dibatasi MAX_BYTES; entri yang paling lama
+# tidak diakses dibuang lebih dulu (LRU).
+ENABLED = os.environ.get('UAS_FIGURE_STORE', '1') != '0'
+DB_PATH = os.environ.get(
+    'UAS_FIGURE_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'figures.sqlite')
+)
+MAX_BYTES = int(float(os.environ.get('UAS_FIGURE_STORE_MB', '64')) * 1024 * 1024)
+
+_local = threading.local()
+
+
+def _code_version():
+    # Figure bergantung pada kode builder: kode yang berubah (deploy baru) = key baru
+    digest = hashlib.blake2b(plotly.__version__.encode(), digest_size=16)
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+CODE_VERSION = _code_version()
+
+# Env yang mengubah isi figure (overlay, ambang WebGL, downsampling, jumlah sampel simulasi,
+# dtype data, filter tahun/negara saat load); nilainya ikut key supaya figure dari konfigurasi
+# lain tidak tersaji ulang. Filter load tidak mengubah data_version (= fingerprint workbook).
+SETTINGS_ENV = ('UAS_HONEST_FIT', 'UAS_WEBGL_THRESHOLD', 'UAS_MAX_POINTS', 'UAS_MC_PATHS',
+                'UAS_BOOTSTRAP', 'UAS_PERMUTATIONS', 'UAS_COMPACT',
+                'UAS_HISTORY_YEARS', 'UAS_COUNTRIES')
+SETTINGS_VERSION = tuple((name, os.environ.get(name)) for name in SETTINGS_ENV)
+
+
+def _connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')  # pembaca proses lain tidak terblokir penulis
+        conn.execute('CREATE TABLE IF NOT EXISTS figures ('
+                     'key TEXT PRIMARY KEY, body TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS figures_accessed ON figures (accessed)')
+        # Total ukuran dijaga trigger, jadi cek batas saat save cukup membaca satu baris
+        # (bukan SUM seluruh tabel). Baris awal diisi dari isi tabel (DB lama tanpa figure_stats).
+        conn.execute('CREATE TABLE IF NOT EXISTS figure_stats ('
+                     'id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)')
+        conn.execute('INSERT OR IGNORE INTO figure_stats (id, total) '
+                     'SELECT 0, COALESCE(SUM(size), 0) FROM figures')
+        conn.execute('CREATE TRIGGER IF NOT EXISTS figures_insert AFTER INSERT ON figures BEGIN '
+                     'UPDATE figure_stats SET total = total + NEW.size WHERE id = 0; END')
+        conn.execute('CREATE TRIGGER IF NOT EXISTS figures_delete AFTER DELETE ON figures BEGIN '
+                     'UPDATE figure_stats SET total = total - OLD.size WHERE id = 0; END')
+        conn.execute('CREATE TRIGGER IF NOT EXISTS figures_resize AFTER UPDATE OF size ON figures BEGIN '
+                     'UPDATE figure_stats SET total = total - OLD.size + NEW.size WHERE id = 0; END')
+        _local.conn = conn
+    return conn
+
+
+def store_key(key):
+    """Key figureCache (data_version, page, chart, parameter...) -> key teks di disk."""
+    return hashlib.blake2b(repr((CODE_VERSION, SETTINGS_VERSION) + tuple(key)).encode(),
+                           digest_size=20).hexdigest()
+
+
+def load(key):
+    """Figure dari disk, atau None (belum ada / store mati / tanpa versi data)."""
+    if not ENABLED or key[0] is None:
+        return None
+    try:
+        conn = _connection()
+        row = conn.execute('SELECT body FROM figures WHERE key = ?', (store_key(key),)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE figures SET accessed = ? WHERE key = ?', (time.time(), store_key(key)))
+    except sqlite3.Error:
+        return None
+    try:
+        with metrics.span(f'figure.disk.{key[1]}.{key[2]}'):
+            return pio.from_json(row[0])
+    except ValueError:
+        # Isi rusak / tidak terbaca plotly versi ini: buang barisnya, figure dibangun ulang
+        try:
+            conn.execute('DELETE FROM figures WHERE key = ?', (store_key(key),))
+        except sqlite3.Error:
+            pass
+        return None
+
+
+def save(key, fig):
+    if not ENABLED or key[0] is None:
+        return
+    body = fig.to_json()
+    try:
+        conn = _connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Upsert (bukan INSERT OR REPLACE): REPLACE menghapus baris tanpa menjalankan trigger delete
+            conn.execute('INSERT INTO figures (key, body, size, accessed) VALUES (?, ?, ?, ?) '
+                         'ON CONFLICT (key) DO UPDATE SET body = excluded.body, size = excluded.size, '
+                         'accessed = excluded.accessed',
+                         (store_key(key), body, len(body), time.time()))
+            _evict(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    except sqlite3.Error:
+        # Cache hanya optimasi: disk penuh / DB terkunci tidak boleh menggagalkan render
+        pass
+
+
+def _evict(conn):
+    total = conn.execute('SELECT total FROM figure_stats WHERE id = 0').fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+    # Buang dari yang paling lama tidak diakses (lewat index accessed) sampai di bawah batas
+    excess = total - MAX_BYTES
+    freed = 0
+    stale = []
+    for key, size in conn.execute('SELECT key, size FROM figures ORDER BY accessed'):
+        stale.append((key,))
+        freed += size
+        if freed >= excess:
+            break
+    conn.executemany('DELETE FROM figures WHERE key = ?', stale)
+
+
+def clear():
+    try:
+        _connection().execute('DELETE FROM figures')
+    except sqlite3.Error:
+        pass
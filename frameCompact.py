@@ -0,0 +1,127 @@
+"""Kompaksi dtype frame dashboard (tahun int16, label categorical, float32 bila aman).
+
+st.cache_data mem-pickle seluruh data pack di setiap akses, jadi ukuran frame langsung
+menjadi biaya memori & copy per sesi. Laporan sebelum/sesudah:
+    python frameCompact.py
+    python frameCompact.py --repeat 100000   # simulasi dataset besar (baris diulang)
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+ENABLED = os.environ.get('UAS_COMPACT', '1') != '0'
+
+YEAR_COLUMNS = ('Tahun',)
+LABEL_COLUMNS = ('Negara', 'Kategori', 'Komponen')
+
+# Besaran yang ditampilkan dengan <= 4 angka penting: presisi float32 (~7 digit) cukup.
+# Kolom float lain hanya diturunkan kalau nilainya tepat sama di float32 (nominal Rupiah
+# penuh & nilai yang tampil mentah sebagai teks, mis. Anggaran(Triliun), tetap float64).
+FLOAT32_COLUMNS = ('Jumlah Lansia (Juta Jiwa)', 'Gaji Pejabat per Tahun (Miliar Rupiah)',
+                   'Proyeksi Gaji DPR (Juta)')
+
+# Kolom teks lain jadi categorical kalau nilai uniknya <= separuh jumlah baris
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _fits(values, dtype):
+    info = np.iinfo(dtype)
+    return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+
+
+def _compact_column(name, col):
+    dtype = col.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return col
+    if pd.api.types.is_integer_dtype(dtype):
+        values = col.to_numpy()
+        # Tahun cukup int16; kolom lain minimal int32 supaya aritmetika builder tidak overflow
+        for target in ((np.int16, np.int32) if name in YEAR_COLUMNS else (np.int32,)):
+            if np.dtype(target).itemsize < dtype.itemsize and _fits(values, target):
+                return col.astype(target)
+        return col
+    if pd.api.types.is_float_dtype(dtype) and dtype.itemsize > 4:
+        values = col.to_numpy()
+        narrow = values.astype(np.float32)
+        if name in FLOAT32_COLUMNS or np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(narrow, index=col.index, name=col.name)
+        return col
+    if pd.api.types.is_string_dtype(dtype) or dtype == object:
+        if name in LABEL_COLUMNS or col.nunique(dropna=False) <= CATEGORY_MAX_RATIO * len(col):
+            return col.astype('category')
+    return col
+
+
+def compact(df):
+    """Return frame dengan dtype ringkas (frame asli tidak diubah)."""
+    if df is None or not ENABLED:
+        return df
+    original = {name: df[name] for name in df.columns}
+    columns = {name: _compact_column(name, col) for name, col in original.items()}
+    if all(columns[name] is original[name] for name in original):
+        return df
+    # copy=False: kolom yang tidak berubah tetap berbagi buffer dengan frame asli
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def compact_frames(frames):
+    return {name: compact(df) for name, df in frames.items()}
+
+
+# --- LAPORAN FOOTPRINT ---
+def memory_bytes(df):
+    return 0 if df is None else int(df.memory_usage(deep=True).sum())
+
+
+def pickled_bytes(obj):
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def report(before, after):
+    """before/after: dict {nama: DataFrame}. Return tabel memori & ukuran pickle per frame."""
+    rows = []
+    for name, df in before.items():
+        if df is None:
+            continue
+        rows.append({
+            'frame': name,
+            'rows': len(df),
+            'memory_before': memory_bytes(df),
+            'memory_after': memory_bytes(after[name]),
+            'pickle_before': pickled_bytes(df),
+            'pickle_after': pickled_bytes(after[name]),
+        })
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        total = table.drop(columns='frame').sum()
+        table.loc[len(table)] = {'frame': 'TOTAL', **total.to_dict()}
+    return table
+
+
+def main():
+    import dataLoader
+
+    parser = argparse.ArgumentParser(description="Laporan footprint data pack sebelum/sesudah kompaksi dtype.")
+    parser.add_argument('--repeat', type=int, default=1, help="Ulang setiap frame N kali (simulasi data besar)")
+    args = parser.parse_args()
+
+    names = ['df1', 'df2', 'df3', 'df4', 'df5', 'df_roi', 'df_trend', 'df_pensiun']
+    for variant in dataLoader.VARIANT_SHEETS:
+        raw = dict(zip(names, dataLoader.load_pack(variant, compact=False)))
+        if args.repeat > 1:
+            raw = {name: None if df is None else pd.concat([df] * args.repeat, ignore_index=True)
+                   for name, df in raw.items()}
+        table = report(raw, {name: compact(df) for name, df in raw.items()})
+        print(f"\n== {variant} ==")
+        print(table.to_string(index=False))
+        total = table.iloc[-1]
+        print(f"pickle data pack: {pickled_bytes(tuple(raw.values()))} -> "
+              f"{pickled_bytes(tuple(compact(df) for df in raw.values()))} bytes "
+              f"(memori {total['memory_before']} -> {total['memory_after']} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+
+# --- TIMING SPANS & METRICS ---
+# UAS_METRICS=1            aktifkan pengukuran (default mati: span() = no-op, overhead ~nol)
+# UAS_METRICS_FILE=path    tulis metrics ke file (.json = JSON, lainnya = Prometheus text);
+#                          '{pid}' di path diganti PID supaya tiap worker punya file sendiri
+# UAS_METRICS_INTERVAL=5   jeda minimal (detik) antar penulisan file
+# UAS_METRICS_PANEL=1      tampilkan panel debug di sidebar
+ENABLED = os.environ.get('UAS_METRICS', '0') == '1'
+METRICS_FILE = os.environ.get('UAS_METRICS_FILE', '')
+FLUSH_INTERVAL = float(os.environ.get('UAS_METRICS_INTERVAL', '5'))
+PANEL = os.environ.get('UAS_METRICS_PANEL', '0') == '1'
+
+# Batas atas bucket histogram (detik), gaya Prometheus
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_histograms = {}  # nama span -> [counts per bucket (+Inf), sum, count, max]
+_last_flush = 0.0
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """Context manager pengukur durasi. Saat metrics mati mengembalikan no-op yang sama."""
+    return _Span(name) if ENABLED else _NOOP
+
+
+def observe(name, seconds):
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = [[0] * (len(BUCKETS) + 1), 0.0, 0, 0.0]
+        hist[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        hist[1] += seconds
+        hist[2] += 1
+        hist[3] = max(hist[3], seconds)
+
+
+def _quantile(counts, total, q):
+    # Perkiraan quantile dari histogram: batas atas bucket tempat quantile jatuh
+    target = q * total
+    running = 0
+    for i, c in enumerate(counts):
+        running += c
+        if running >= target:
+            return BUCKETS[i] if i < len(BUCKETS) else float('inf')
+    return float('inf')
+
+
+def snapshot():
+    """Ringkasan semua span: {nama: {count, sum_s, mean_ms, max_ms, p50_ms, p95_ms, buckets}}."""
+    with _lock:
+        items = [(name, list(h[0]), h[1], h[2], h[3]) for name, h in _histograms.items()]
+    summary = {}
+    for name, counts, total_s, count, max_s in sorted(items):
+        summary[name] = {
+            'count': count,
+            'sum_s': total_s,
+            'mean_ms': total_s / count * 1000 if count else 0.0,
+            'max_ms': max_s * 1000,
+            'p50_ms': _quantile(counts, count, 0.50) * 1000,
+            'p95_ms': _quantile(counts, count, 0.95) * 1000,
+            'buckets': dict(zip([str(b) for b in BUCKETS] + ['+Inf'], counts)),
+        }
+    return summary
+
+
+def to_prometheus():
+    lines = [
+        '# HELP uas_span_duration_seconds Durasi tahap rerun dashboard',
+        '# TYPE uas_span_duration_seconds histogram',
+    ]
+    for name, stats in snapshot().items():
+        label = name.replace('\\', '\\\\').replace('"', '\\"')
+        cumulative = 0
+        for le, count in stats['buckets'].items():
+            cumulative += count
+            lines.append(f'uas_span_duration_seconds_bucket{{span="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'uas_span_duration_seconds_sum{{span="{label}"}} {stats["sum_s"]:.6f}')
+        lines.append(f'uas_span_duration_seconds_count{{span="{label}"}} {stats["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def to_json():
+    return json.dumps({'pid': os.getpid(), 'timestamp': time.time(), 'spans': snapshot()}, indent=2)
+
+
+def flush(force=False):
+    """Tulis file metrics (atomik) kalau UAS_METRICS_FILE diset dan interval sudah lewat."""
+    global _last_flush
+    if not (ENABLED and METRICS_FILE):
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < FLUSH_INTERVAL:
+        return
+    _last_flush = now
+
+    path = METRICS_FILE.replace('{pid}', str(os.getpid()))
+    content = to_json() if path.endswith('.json') else to_prometheus()
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # metrics tidak boleh menggagalkan render
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def show_panel():
+    """Panel debug di sidebar (UAS_METRICS_PANEL=1)."""
+    if not (ENABLED and PANEL):
+        return
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Debug: Timing", expanded=False):
+        stats = snapshot()
+        if not stats:
+            st.caption("Belum ada data.")
+            return
+        table = pd.DataFrame([
+            {'span': name, 'n': s['count'], 'mean ms': s['mean_ms'], 'p95 ms': s['p95_ms'], 'max ms': s['max_ms']}
+            for name, s in stats.items()
+        ])
+        st.dataframe(table.round(2), hide_index=True, use_container_width=True)
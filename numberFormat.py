@@ -0,0 +1,82 @@
+import functools
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# --- FORMAT ANGKA RUPIAH (dipakai kedua halaman) ---
+# Satuan dipilih per elemen secara vektor; teks tiap nilai unik dibuat sekali lalu di-cache,
+# jadi ribuan baris dengan nilai berulang hanya butuh beberapa f-string.
+
+
+class Unit(NamedTuple):
+    threshold: float   # nilai >= threshold memakai satuan ini (urut dari terbesar)
+    divisor: float
+    suffix: str
+    decimals: int
+    grouping: bool     # pemisah ribuan
+    indo: bool         # konvensi Indonesia: koma desimal, titik ribuan
+
+
+class Style(NamedTuple):
+    units: tuple
+    prefix: str = ''
+
+
+_BASE = -math.inf
+_SWAP_SEPARATORS = str.maketrans(',.', '.,')
+
+# Label batang Komparasi Gaji (Framing): "12 T", "1.5 T", "42 M", "150,000"
+RUPIAH = Style((
+    Unit(1e13, 1e12, ' T', 0, False, False),
+    Unit(1e12, 1e12, ' T', 1, False, False),
+    Unit(1e9, 1e9, ' M', 0, False, False),
+    Unit(_BASE, 1, '', 0, True, False),
+))
+
+# Label ROI: "1,25 T", "3,40 M", "2.50 Juta", "750.000"
+INDO = Style((
+    Unit(1e12, 1e12, ' T', 2, False, True),
+    Unit(1e9, 1e9, ' M', 2, False, True),
+    Unit(1e6, 1e6, ' Juta', 2, False, False),
+    Unit(_BASE, 1, '', 0, True, True),
+))
+
+# Label per kapita (Real): "Rp 1,234.5 Juta", "Rp 750,000"
+JUTA = Style((
+    Unit(1e6, 1e6, ' Juta', 1, True, False),
+    Unit(_BASE, 1, '', 0, True, False),
+), prefix='Rp ')
+
+# Nilai yang sudah dalam miliar (chart gap): "2,48 M"
+MILIAR = Style((
+    Unit(_BASE, 1, ' M', 2, True, True),
+))
+
+
+@functools.lru_cache(maxsize=8192)
+def _text(number, unit, prefix):
+    """Teks satu angka yang sudah dibagi satuannya (di-cache per nilai)."""
+    text = f"{number:{',' if unit.grouping else ''}.{unit.decimals}f}"
+    if unit.indo:
+        text = text.translate(_SWAP_SEPARATORS)
+    return f"{prefix}{text}{unit.suffix}"
+
+
+def format_value(value, style):
+    """Format satu nilai."""
+    unit = next((u for u in style.units if value >= u.threshold), style.units[-1])
+    return _text(value / unit.divisor, unit, style.prefix)
+
+
+def format_values(values, style):
+    """Format seluruh array/Series sekaligus. Return ndarray object berisi string."""
+    values = np.asarray(values, dtype=float)
+    uniques, inverse = np.unique(values, return_inverse=True)
+    # Satuan per nilai dipilih sekaligus; NaN (tidak lolos ambang mana pun) jatuh ke satuan terakhir
+    unit_index = np.select([uniques >= u.threshold for u in style.units],
+                           np.arange(len(style.units)), default=len(style.units) - 1)
+    scaled = uniques / np.array([u.divisor for u in style.units])[unit_index]
+    labels = np.array([_text(float(v), style.units[i], style.prefix) for v, i in zip(scaled, unit_index)],
+                      dtype=object)
+    return labels[inverse.reshape(values.shape)]
@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# --- SCATTER BESAR (WebGL) ---
+# Di atas WEBGL_THRESHOLD titik, scatter SVG + label per titik jadi berat di browser.
+# Mode WebGL: semua titik dalam satu trace Scattergl (hover saja, tanpa label), lalu
+# negara sorotan digambar ulang di trace kecil dengan label teks.
+WEBGL_THRESHOLD = int(os.environ.get('UAS_WEBGL_THRESHOLD', '1000'))
+
+HIGHLIGHT_COUNTRIES = ('Indonesia', 'Singapura', 'Australia')
+
+
+def use_webgl(df):
+    return len(df) > WEBGL_THRESHOLD
+
+
+def _hover_text(df, label):
+    # Data multi-tahun: tampilkan "Negara (Tahun)" supaya titik negara yang sama bisa dibedakan
+    if 'Tahun' in df.columns:
+        return (df[label].astype(str) + ' (' + df['Tahun'].astype(str) + ')').to_numpy()
+    return df[label].astype(str).to_numpy()
+
+
+def scatter(df, x, y, label='Negara', color_map=None, base_color='#888888',
+            highlight=HIGHLIGHT_COUNTRIES, marker_size=12):
+    """Scatter WebGL: satu trace untuk semua titik + trace berlabel untuk negara sorotan."""
+    color_map = color_map or {}
+    palette = px.colors.qualitative.Plotly
+    is_highlight = df[label].isin(highlight).to_numpy()
+    hover = _hover_text(df, label)
+
+    fig = go.Figure()
+    rest = df[~is_highlight]
+    fig.add_trace(go.Scattergl(
+        x=rest[x].to_numpy(), y=rest[y].to_numpy(), mode='markers',
+        hovertext=hover[~is_highlight], hoverinfo='text+x+y',
+        marker=dict(size=marker_size * 0.6, color=base_color, opacity=0.6),
+        name='Negara lain'
+    ))
+
+    for i, name in enumerate(h for h in highlight if h in set(df.loc[is_highlight, label])):
+        rows = np.flatnonzero(is_highlight & (df[label] == name).to_numpy())
+        points = df.iloc[rows]
+        # Label hanya di titik terakhir (tahun terbaru) supaya tidak menumpuk
+        text = [''] * (len(points) - 1) + [name]
+        fig.add_trace(go.Scattergl(
+            x=points[x].to_numpy(), y=points[y].to_numpy(), mode='markers+text',
+            text=text, textposition='top center', hovertext=hover[rows], hoverinfo='text+x+y',
+            marker=dict(size=marker_size, color=color_map.get(name, palette[i % len(palette)]),
+                        line=dict(width=1, color='white')),
+            name=name
+        ))
+    return fig
@@ -0,0 +1,204 @@
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import derivedColumns
+import metrics
+
+# Nilai slider "Multiplier Kebijakan" (0.5x - 3.0x, step 0.5) di kedua halaman
+MULTIPLIERS = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0)
+
+# Tahun terakhir data asli; multiplier hanya berlaku untuk Tahun > BASE_YEAR
+BASE_YEAR = 2023
+
+COL_GAJI = 'Proyeksi Gaji DPR (Juta)'
+SHEET = 'Proyeksi Masa Depan'
+
+
+class ScenarioTable(NamedTuple):
+    positions: dict        # nama skenario -> urutan blok di tabel
+    n_years: int
+    proyeksi: pd.DataFrame  # long format: satu blok n_years baris per skenario
+    roi: pd.DataFrame       # long format: satu blok per skenario (None kalau df_roi None)
+
+
+def ramp(start, end, year_start=BASE_YEAR + 1, year_end=2027):
+    """Jadwal multiplier naik linear, mis. ramp(1.0, 3.0) = 1.0x di 2024 -> 3.0x di 2027."""
+    return {year_start: start, year_end: end}
+
+
+def schedule_matrix(schedules, years):
+    """Matriks multiplier (skenario x tahun).
+
+    Jadwal berupa angka = multiplier konstan; berupa dict {tahun: multiplier} = interpolasi
+    linear antar titik (konstan di luar titik pertama/terakhir). Tahun <= BASE_YEAR selalu 1.0x.
+    """
+    years = np.asarray(years, dtype=float)
+    matrix = np.empty((len(schedules), len(years)))
+
+    is_flat = np.array([np.isscalar(s) for s in schedules], dtype=bool)
+    if is_flat.any():
+        flat = np.array([s for s in schedules if np.isscalar(s)], dtype=float)
+        matrix[is_flat] = flat[:, None]
+    for i in np.flatnonzero(~is_flat):
+        points = sorted(schedules[i].items())
+        matrix[i] = np.interp(years, [p[0] for p in points], [p[1] for p in points])
+
+    return np.where(years > BASE_YEAR, matrix, 1.0)
+
+
+def run(df5, df_roi, schedules):
+    """Hitung semua skenario sekaligus dalam satu operasi NumPy.
+
+    schedules: dict {nama skenario: multiplier atau jadwal per tahun}.
+    ROI memakai multiplier tahun proyeksi terakhir dari tiap skenario.
+    """
+    with metrics.span('simulation.run'):
+        return _run(df5, df_roi, schedules)
+
+
+def _run(df5, df_roi, schedules):
+    names = list(schedules)
+    years = df5['Tahun'].to_numpy()
+    matrix = schedule_matrix([schedules[n] for n in names], years)
+    n_scen, n_years = matrix.shape
+
+    gaji = df5[COL_GAJI].to_numpy(dtype=float)[None, :] * matrix
+
+    columns = {'Skenario': np.repeat(np.array(names, dtype=object), n_years)}
+    for col in df5.columns:
+        columns[col] = np.tile(df5[col].to_numpy(), n_scen)
+    columns[COL_GAJI] = gaji.ravel()
+    columns['Multiplier'] = matrix.ravel()
+    # Kolom turunan gaji (Gaji_Miliar) mengikuti gaji per skenario
+    derivedColumns.recompute(SHEET, columns, COL_GAJI)
+    proyeksi = pd.DataFrame(columns)
+
+    roi = None
+    if df_roi is not None:
+        n_rows = len(df_roi)
+        final_factor = matrix[:, -1]
+        roi_columns = {'Skenario': np.repeat(np.array(names, dtype=object), n_rows)}
+        for col in df_roi.columns:
+            roi_columns[col] = np.tile(df_roi[col].to_numpy(), n_scen)
+        roi_columns['Nominal'] = (df_roi['Nominal'].to_numpy(dtype=float)[None, :] * final_factor[:, None]).ravel()
+        roi = pd.DataFrame(roi_columns)
+
+    return ScenarioTable({name: i for i, name in enumerate(names)}, n_years, proyeksi, roi)
+
+
+def select(table, name):
+    """Ambil (df5_simulated, df_roi_simulated) satu skenario sebagai slice blok (tanpa scan)."""
+    i = table.positions[name]
+    df5_simulated = table.proyeksi.iloc[i * table.n_years:(i + 1) * table.n_years]
+    df_roi_simulated = None
+    if table.roi is not None:
+        n_rows = len(table.roi) // len(table.positions)
+        df_roi_simulated = table.roi.iloc[i * n_rows:(i + 1) * n_rows]
+    return df5_simulated, df_roi_simulated
+
+
+# --- SKENARIO SLIDER ---
+# Tabel untuk semua nilai slider dihitung sekali per isi df5/df_roi lalu dipakai ulang.
+# Key = isi frame (bukan id objek): dataStore memberi view baru tiap rerun dengan isi yang sama.
+_slider_tables = {}
+
+
+def _frame_key(df):
+    if df is None:
+        return None
+    # hash_pandas_object juga meng-hash isi kolom teks (tobytes array object hanya berisi pointer)
+    return (tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes),
+            pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+
+
+def slider_table(df5, df_roi):
+    key = (_frame_key(df5), _frame_key(df_roi))
+    cached = _slider_tables.get(key)
+    if cached is not None:
+        return cached
+
+    table = run(df5, df_roi, {factor: factor for factor in MULTIPLIERS})
+    if len(_slider_tables) >= 8:
+        _slider_tables.clear()
+    _slider_tables[key] = table
+    return table
+
+
+def simulate(df5, df_roi, simulation_factor):
+    """Pengganti copy-and-multiply per rerun: slice skenario dari tabel slider."""
+    table = slider_table(df5, df_roi)
+    if simulation_factor not in table.positions:
+        table = run(df5, df_roi, {simulation_factor: simulation_factor})
+    return select(table, simulation_factor)
+
+
+# --- MONTE CARLO (pita ketidakpastian chart 10) ---
+# Semua jalur disimulasikan sekaligus sebagai matriks (jalur x tahun); hanya tahun > BASE_YEAR
+# yang diberi ketidakpastian, tahun data asli tetap deterministik.
+N_PATHS = int(os.environ.get('UAS_MC_PATHS', '100000'))
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_mc_cache = {}
+
+
+class Uncertainty(NamedTuple):
+    growth_sd: float = 0.03      # deviasi log pertumbuhan gaji per tahun (kumulatif)
+    multiplier_sd: float = 0.10  # deviasi log eksekusi multiplier kebijakan
+    elasticity: float = 0.3      # elastisitas kasus korupsi terhadap deviasi gaji
+    elasticity_sd: float = 0.15
+
+
+def monte_carlo(df5, simulation_factor, uncertainty=Uncertainty(), n_paths=N_PATHS, seed=0):
+    """Persentil proyeksi gaji (miliar) & kasus korupsi per tahun.
+
+    Return DataFrame: Tahun, Gaji_Miliar_p{5..95}, Kasus_p{5..95}. Di-cache per parameter
+    (isi df5, multiplier, ketidakpastian, jumlah jalur, seed).
+    """
+    years = df5['Tahun'].to_numpy()
+    gaji = df5[COL_GAJI].to_numpy(dtype=float)
+    kasus = df5['Proyeksi Kasus Korupsi'].to_numpy(dtype=float)
+    key = (years.tobytes(), gaji.tobytes(), kasus.tobytes(), float(simulation_factor), uncertainty, n_paths, seed)
+    cached = _mc_cache.get(key)
+    if cached is not None:
+        return cached
+
+    with metrics.span('simulation.monte_carlo'):
+        bands = _monte_carlo(years, gaji, kasus, simulation_factor, uncertainty, n_paths, seed)
+    if len(_mc_cache) >= 32:
+        _mc_cache.clear()
+    _mc_cache[key] = bands
+    return bands
+
+
+def _monte_carlo(years, gaji, kasus, factor, u, n_paths, seed):
+    rng = np.random.default_rng(seed)
+    future = years > BASE_YEAR
+    n_future = int(future.sum())
+
+    # Deviasi log gaji per jalur: eksekusi multiplier (sekali per jalur) + random walk pertumbuhan
+    log_dev = np.zeros((n_paths, len(years)))
+    if n_future:
+        walk = np.cumsum(rng.normal(0.0, u.growth_sd, (n_paths, n_future)), axis=1)
+        log_dev[:, future] = rng.normal(0.0, u.multiplier_sd, (n_paths, 1)) + walk
+
+    multiplier = np.where(future, factor, 1.0)
+    gaji_paths = (gaji * multiplier)[None, :] * np.exp(log_dev) / 1000
+    elasticity = rng.normal(u.elasticity, u.elasticity_sd, (n_paths, 1))
+    kasus_paths = kasus[None, :] * np.exp(-elasticity * log_dev)
+
+    gaji_q = np.percentile(gaji_paths, PERCENTILES, axis=0)
+    kasus_q = np.percentile(kasus_paths, PERCENTILES, axis=0)
+    columns = {'Tahun': years}
+    for i, p in enumerate(PERCENTILES):
+        columns[f'Gaji_Miliar_p{p}'] = gaji_q[i]
+    for i, p in enumerate(PERCENTILES):
+        columns[f'Kasus_p{p}'] = kasus_q[i]
+    return pd.DataFrame(columns)
+
+
+def clear():
+    _slider_tables.clear()
+    _mc_cache.clear()
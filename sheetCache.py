@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+import dataSources
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Tanpa pyarrow cache dimatikan, loader tetap jalan dari Excel
+    pa = None
+
+# --- CACHE KOLUMNAR (Arrow IPC) ---
+# Frame yang sudah dibersihkan disimpan per sheet di <CACHE_DIR>/<key>/<sheet>.arrow.
+# Key = fingerprint isi sheet (dataLoader.sheet_fingerprints), jadi semua proses/replica di
+# host yang sama berbagi cache, dan sheet yang diedit otomatis mendapat folder baru.
+CACHE_DIR = os.environ.get(
+    'UAS_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'sheets')
+)
+
+
+def enabled():
+    return pa is not None and os.environ.get('UAS_SHEET_CACHE', '1') != '0'
+
+
+def _sheet_path(key, sheet_name):
+    return os.path.join(CACHE_DIR, key, f"{dataSources.sheet_slug(sheet_name)}.arrow")
+
+
+def exists(key, sheet_name):
+    return enabled() and os.path.exists(_sheet_path(key, sheet_name))
+
+
+def read(key, sheet_name, query=None):
+    """Baca satu sheet dari cache (memory-mapped). Return None kalau belum ada / rusak.
+
+    Query (kolom, Tahun, Negara) diterapkan pada tabel Arrow sebelum konversi ke pandas,
+    jadi baris yang tidak ditampilkan tidak pernah disalin keluar dari file.
+    """
+    if not enabled():
+        return None
+    path = _sheet_path(key, sheet_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            return dataSources.filter_table(table, query).to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+
+def write(key, sheet_name, df):
+    """Tulis satu sheet ke cache secara atomik (tmp file + rename)."""
+    if not enabled() or df is None:
+        return
+    path = _sheet_path(key, sheet_name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(df)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, pa.ArrowException):
+        # Cache hanya optimasi: gagal tulis (disk penuh, read-only) tidak boleh menggagalkan load
+        pass
@@ -0,0 +1,8 @@
+# --- GLOBAL COLORS ---
+# Dipisah dari app.py supaya chart builder bisa dipakai di luar Streamlit (benchmark, export)
+class Theme:
+    BAD = "#FF0055"
+    GOOD = "#00FF9F"
+    NEUTRAL = "#4A90E2"
+    BG = "#121212"
+    TEXT = "#FFFFFF"
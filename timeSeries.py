@@ -0,0 +1,53 @@
+import numpy as np
+
+# --- DERET WAKTU TERURUT TAHUN ---
+# Sheet berkolom Tahun diurutkan sekali saat load (dataLoader), jadi rentang tahun cukup
+# dicari dengan binary search (np.searchsorted) lalu diambil sebagai slice iloc (view, tanpa
+# scan mask boolean & tanpa salinan). Rentang dipilih lewat slider "Rentang Tahun" di sidebar.
+
+YEAR_COLUMN = 'Tahun'
+
+# Posisi frame deret waktu historis di data pack: df2 (Korelasi Lansia), df_trend, df_pensiun.
+# df5 (proyeksi) tidak ikut: tahunnya proyeksi masa depan, bukan data historis.
+PACK_SERIES = (1, 6, 7)
+
+
+def sort_by_year(df):
+    """Frame urut Tahun (stabil). Frame yang sudah urut / tanpa kolom Tahun dikembalikan apa adanya."""
+    if df is None or YEAR_COLUMN not in df.columns or df[YEAR_COLUMN].is_monotonic_increasing:
+        return df
+    return df.sort_values(YEAR_COLUMN, kind='stable').reset_index(drop=True)
+
+
+def sort_frames(frames):
+    return {name: sort_by_year(df) for name, df in frames.items()}
+
+
+def year_slice(df, years):
+    """Baris dengan Tahun di rentang [awal, akhir] (inklusif). years None = semua baris."""
+    if df is None or years is None:
+        return df
+    values = df[YEAR_COLUMN].to_numpy()
+    start = np.searchsorted(values, years[0], side='left')
+    end = np.searchsorted(values, years[1], side='right')
+    return df.iloc[start:end]
+
+
+def slice_pack(data_pack, years):
+    """Data pack dengan frame deret waktu dipotong ke rentang tahun (frame lain tetap)."""
+    if years is None:
+        return data_pack
+    return tuple(year_slice(df, years) if i in PACK_SERIES else df for i, df in enumerate(data_pack))
+
+
+def year_bounds(data_pack):
+    """(tahun awal, tahun akhir) gabungan semua deret waktu di pack, atau None kalau kosong."""
+    ends = [(df[YEAR_COLUMN].iloc[0], df[YEAR_COLUMN].iloc[-1])
+            for i, df in enumerate(data_pack) if i in PACK_SERIES and df is not None and len(df)]
+    if not ends:
+        return None
+    return int(min(start for start, _ in ends)), int(max(end for _, end in ends))
+
+
+def has_rows(df):
+    return df is not None and len(df) > 0
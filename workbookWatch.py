@@ -0,0 +1,51 @@
+import os
+import threading
+
+import metrics
+
+# --- WATCHER SUMBER DATA ---
+# Thread latar memeriksa versi sumber data setiap UAS_WATCH_INTERVAL detik (0 = mati).
+# Untuk Excel: cek mtime/ukuran dulu, fingerprint per sheet baru dihitung kalau berubah.
+# Versi baru baru dipublikasikan SETELAH sheet yang berubah selesai di-parse ke cache,
+# jadi rerun berikutnya langsung memuat data pack baru dari cache tanpa menunggu parsing.
+# Sheet yang gagal di-parse tidak menahan versi baru: hanya halaman yang memakainya yang
+# menampilkan error load (lihat app.load_data), halaman lain tetap mendapat data terbaru.
+POLL_SECONDS = float(os.environ.get('UAS_WATCH_INTERVAL', '2'))
+
+
+class Watcher:
+    def __init__(self, source, interval=POLL_SECONDS):
+        self.source = source
+        self.interval = interval
+        self.version = source.version()
+        self.last_changed = []
+        self._stop = threading.Event()
+        if interval > 0:
+            threading.Thread(target=self._run, name='uas-data-watcher', daemon=True).start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """Periksa sekali. Return True kalau versi baru dipublikasikan."""
+        try:
+            version = self.source.version()
+        except Exception:
+            # File sedang disimpan / sementara hilang dsb.: coba lagi di poll berikutnya
+            return False
+        if version == self.version:
+            return False
+        try:
+            with metrics.span('reload.prepare'):
+                changed = self.source.prepare()
+        except Exception:
+            # prepare hanya mengisi cache lebih awal; versi tetap dipublikasikan dan
+            # sheet yang belum ter-cache di-parse (atau gagal dengan pesan) saat load
+            changed = []
+        self.last_changed = changed
+        self.version = version  # satu assignment: sesi melihat versi lama atau baru, tidak pernah campuran
+        return True
+
+    def stop(self):
+        self._stop.set()